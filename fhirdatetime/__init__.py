@@ -38,41 +38,101 @@ False
 
 from __future__ import annotations
 
-import re
-from datetime import MAXYEAR, MINYEAR, UTC, date, datetime, timedelta, tzinfo as tzinfo_
-from operator import itemgetter
-from typing import TYPE_CHECKING, Self, SupportsIndex, TypeAlias, overload
+from datetime import MAXYEAR, MINYEAR, UTC, date, datetime, timedelta, timezone, tzinfo as tzinfo_
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, Literal, Self, SupportsIndex, TypeAlias, overload
 
+from ._array import FhirDateArray, FhirDateTimeArray
+from ._cache import CacheInfo, ParseCache, parse_cache
 from ._datetime import (
     _check_int_field,
-    _cmp,
     _Date,
     _DateTime,
     _days_in_month,
     _format_offset,
     _format_time,
 )
+from ._exact import FhirExactDict, FhirExactSet
+from ._external import ExternalSorter, SortProgress
+from ._intern import InternTable, intern_table
+from ._keys import (
+    _US_PER_DAY,
+    Bounds,
+    _aligned_bounds,
+    _bounds,
+    _cmp_bounds,
+    _date_sort_key,
+    _instant_sort_key,
+    _sort_key,
+)
+from ._parser import (
+    _BUFFER_TYPES,
+    Buffer,
+    Fields,
+    ParseError,
+    Precision,
+    _as_str,
+    _is_canonical,
+    _offset_tzinfo,
+    _parse,
+    _try_parse,
+    parse_fields,
+)
+from ._path import _compile_path
+from ._search import matches
+from ._sort import argsort, earliest, latest, nlargest, nsmallest, sort_values
+from ._timeline import SortedTimeline
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
-
-__all__ = ["FhirDate", "FhirDateTime", "__version__"]
+    from collections.abc import Callable, Hashable, Iterable, Iterator
+
+__all__ = [
+    "CacheInfo",
+    "ExternalSorter",
+    "FhirDate",
+    "FhirDateArray",
+    "FhirDateTime",
+    "FhirDateTimeArray",
+    "FhirExactDict",
+    "FhirExactSet",
+    "InternTable",
+    "ParseCache",
+    "ParseError",
+    "Precision",
+    "Relation",
+    "SortProgress",
+    "SortedTimeline",
+    "__version__",
+    "argsort",
+    "earliest",
+    "intern_table",
+    "latest",
+    "matches",
+    "nlargest",
+    "nsmallest",
+    "parse_cache",
+    "parse_fields",
+    "sort_values",
+]
 __version__ = "1.0.0"
 
 DATE_FIELDS = ("year", "month", "day")
 TIME_FIELDS = ("hour", "minute", "second", "microsecond")
-_y_pat = re.compile(r"^(\d{4})$")
-_ym_pat = re.compile(r"^(\d{4})-(\d{2})$")
-_ymd_pat = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
-# Matches a literal leap second (:60) in the seconds position of the time
-# portion only (the `T\d{2}:\d{2}:` anchor requires it to follow the
-# hour:minute of a time component, not just any ":60" substring).
-_leap_second_pat = re.compile(r"(T\d{2}:\d{2}:)60(\.\d+)?")
-_y_format = "{_year:04d}"
-_ym_format = _y_format + "-{_month:02d}"
-_ymd_format = _ym_format + "-{_day:02d}"
-
-# Indexes used by __getitem__ / sort_key() to expose fields positionally.
+_LEN_YMD = 10  # len("YYYY-MM-DD")
+_LEN_OFFSET_SUFFIX = 6  # len("+hh:mm")
+# `FhirDateTime._utcoffset` before `utcoffset()` has worked it out (it may
+# well be None).
+_UNCACHED: Any = object()
+
+# `isoformat()`'s "+hh:mm" suffix for each offset seen so far, so it's only
+# formatted once per offset. Keyed by the fixed-offset `timezone` itself
+# where possible, skipping `utcoffset()` entirely, since its offset doesn't
+# depend on the value it's attached to; other tzinfos' are keyed by the
+# `timedelta` offset. Only whole-minute offsets are cached, bounding this at
+# 2879 entries of each kind.
+_offset_suffixes: dict[tzinfo_ | timedelta, str] = {}
+
+# Indexes used by __getitem__ to expose fields positionally.
 _IDX_YEAR = 0
 _IDX_MONTH = 1
 _IDX_DAY = 2
@@ -97,15 +157,90 @@ DateFields: TypeAlias = tuple[int, _Field, _Field]
 # microsecond, tzinfo, fold) order.
 TimeFields: TypeAlias = tuple[_Field, _Field, int, int, tzinfo_ | None, int]
 # The `year` positional accepted by `FhirDate.__new__`/`__init__`: an
-# explicit year, an ISO string to parse, or an existing date to copy from.
-DateArg: TypeAlias = int | str | date
+# explicit year, an ISO string (or ASCII buffer) to parse, or an existing
+# date to copy from.
+DateArg: TypeAlias = int | str | Buffer | date
 # The `year` positional accepted by `FhirDateTime.__new__`/`__init__`: an
-# explicit year, an ISO string to parse, or an existing date/datetime to
-# copy from.
-YearArg: TypeAlias = int | str | datetime | date
-# What `sort_key()`'s returned callable produces: -1 stands in for
-# unpopulated fields.
-SortableFields: TypeAlias = tuple[int, ...]
+# explicit year, an ISO string (or ASCII buffer) to parse, or an existing
+# date/datetime to copy from.
+YearArg: TypeAlias = int | str | Buffer | datetime | date
+# What `sort_key()`'s returned callable produces: see `_sort_key`.
+SortableFields: TypeAlias = int
+# What `FhirDateTime.sort_key()` orders values by: their local fields or
+# the UTC instant they start at.
+SortBy: TypeAlias = Literal["fields", "instant"]
+# Which instant of a partial value's interval `nsmallest()` and friends rank
+# it by: its first or its last.
+Assume: TypeAlias = Literal["earliest", "latest"]
+# A FHIR date search prefix, as taken by `matches()`.
+SearchPrefix: TypeAlias = Literal["eq", "ne", "gt", "lt", "ge", "le", "sa", "eb", "ap"]
+# Where `sort_key(attr_path)` puts items whose path leads to no value.
+MissingPosition: TypeAlias = Literal["first", "last", "raise"]
+# The key standing in for a missing value, for each `MissingPosition`.
+# Every real key is non-negative and below 2**64.
+_MISSING_KEYS: dict[str, int | None] = {"first": -1, "last": 1 << 64, "raise": None}
+# What `parse_many()` does with a value that doesn't parse.
+ErrorPolicy: TypeAlias = Literal["raise", "skip", "collect"]
+# One value `parse_many(..., errors="collect")` couldn't parse, as
+# (index, input, reason).
+ParseFailure: TypeAlias = tuple[int, object, ParseError]
+_ERROR_POLICIES = ("raise", "skip", "collect")
+# What the constructors hand to the parser rather than treating as a year.
+_PARSEABLE_TYPES = (str, *_BUFFER_TYPES)
+
+
+def _parse_many(
+    parse: Callable[[object], FhirDate | ParseError],
+    strict: Callable[[str], FhirDate],
+    strings: Iterable[object],
+    errors: ErrorPolicy,
+    failures: list[ParseFailure],
+) -> Iterator[FhirDate]:
+    # The loop behind `parse_many()`. `parse` is a `try_parse()`-alike and
+    # `strict` the matching `fromisoformat()`, only called to raise the
+    # usual exception for the first bad value.
+    raising = errors == "raise"
+    collecting = errors == "collect"
+    record = failures.append
+    for i, s in enumerate(strings):
+        value = parse(s)
+        if value.__class__ is not ParseError:
+            yield value
+        elif raising:
+            try:
+                strict(s)  # ty: ignore[invalid-argument-type]
+            except (TypeError, ValueError) as e:
+                e.add_note(f"parse_many(): item {i} is {s!r}")
+                raise
+        elif collecting:
+            record((i, s, value))
+
+
+def _path_key(
+    attr_path: str, key: Callable[[FhirDate], int], cls: type[FhirDate], missing: MissingPosition
+) -> Callable[[object], int]:
+    # `cls.sort_key(attr_path)`'s callable: `key` applied to whatever
+    # `attr_path` leads to, which may also be a FHIR string to parse. Every
+    # key takes a plain FhirDate as well as a FhirDateTime.
+    if missing not in _MISSING_KEYS:
+        msg = f"missing must be one of {', '.join(_MISSING_KEYS)}, not {missing!r}"
+        raise ValueError(msg)
+    extract = _compile_path(attr_path)
+    missing_key = _MISSING_KEYS[missing]
+    expected = cls.__name__ if cls is FhirDate else f"{cls.__name__} or FhirDate"
+
+    def caller(obj: object) -> int:
+        value = extract(obj)
+        if isinstance(value, str):
+            value = FhirDateTime.fromisoformat(value)
+        elif not isinstance(value, FhirDate):
+            if value is None and missing_key is not None:
+                return missing_key
+            msg = f"attr_path must lead to an instance of {expected}, not {type(value).__name__}"
+            raise TypeError(msg)
+        return key(value)
+
+    return caller
 
 
 def _check_date_fields(year: int, month: _Field, day: _Field) -> DateFields:
@@ -202,9 +337,34 @@ def _check_time_fields(  # noqa: C901, PLR0912, PLR0913, PLR0917
     return hour, minute, second, microsecond, tzinfo, fold
 
 
+class Relation(StrEnum):
+    """How two values' implied intervals relate, as returned by :meth:`FhirDate.relation`."""
+
+    BEFORE = "before"
+    """Ends at or before the other starts."""
+    AFTER = "after"
+    """Starts at or after the other ends."""
+    EQUAL = "equal"
+    """Covers exactly the same interval."""
+    CONTAINS = "contains"
+    """Covers all of the other, and more."""
+    WITHIN = "within"
+    """Covered by the other, which spans more."""
+    OVERLAPS = "overlaps"
+    """Shares part, but not all, of the other's interval."""
+
+
 class FhirDate(_Date, date):
     """Type for representing date values from FHIR data."""
 
+    # Class-level defaults for what an instance only sometimes sets, so that
+    # reading them never needs the instance `__dict__`.
+    _source: str | None = None
+    _bounds: Bounds | None = None
+    _hour: int | None = None
+    # Only an unparsed lazy instance sets this (see `lazy()`).
+    _lazy: bool = False
+
     def __new__(cls, year: DateArg, *_: object, **__: object) -> Self:
         """Start creating FhirDate instance."""
         # Give date.__new__() an arbitrary date to pass its value checks
@@ -221,9 +381,14 @@ class FhirDate(_Date, date):
         if isinstance(year, (datetime, date)):
             self._replace_with(year)
             return
-        if isinstance(year, str):
-            dt = FhirDateTime.fromisoformat(year)
-            self._replace_with(dt)
+        if isinstance(year, _PARSEABLE_TYPES):
+            source = _as_str(year)
+            if parse_cache.maxsize:
+                self._replace_with(FhirDateTime.fromisoformat(source))
+            else:
+                # Accepts any FHIR dateTime, keeping only its date portion.
+                _Date.__init__(self, *_parse(source)[:3])
+            self._source = source
             return
 
         # Check values are within acceptable ranges
@@ -236,24 +401,181 @@ class FhirDate(_Date, date):
         The full format looks like 'YYYY-MM-DD'. By default, any missing part
         is omitted.
         """
-        if self._month is None:
-            fmt = _y_format
-        elif self._day is None:
-            fmt = _ym_format
-        else:
-            fmt = _ymd_format
+        source = self._source
+        if self._lazy and source is not None and len(source) <= _LEN_YMD:
+            # Not parsed yet. Every date-only shape is canonical.
+            return source
+        month = self._month
+        if month is None:
+            return f"{self._year:04d}"
+        day = self._day
+        if day is None:
+            return f"{self._year:04d}-{month:02d}"
+        return f"{self._year:04d}-{month:02d}-{day:02d}"
+
+    @property
+    def source(self) -> str | None:
+        """The string this value was parsed from, exactly as given.
+
+        ``None`` if it wasn't created from a string (or bytes). Unlike
+        :meth:`isoformat`, this keeps the original's ``Z``, fractional
+        digits, and leap second.
+
+        A :class:`FhirDate` shared through :data:`intern_table` keeps the
+        source of whichever instance was interned first, which may be
+        ``None`` or another string naming the same date (such as a full
+        date and time), even when it's returned by :meth:`fromisoformat`.
+        Use :meth:`to_fhir` for a string that's always there.
+        """
+        return self._source
 
-        return fmt.format(**self.__dict__)
+    def to_fhir(self) -> str:
+        """Return this value as a FHIR ``date`` string.
+
+        That's :attr:`source` when this value was parsed from a date-only
+        string, without any formatting work, and :meth:`isoformat`
+        otherwise.
+        """
+        source = self._source
+        if source is not None and len(source) <= _LEN_YMD:
+            return source
+        return self.isoformat()
 
     @classmethod
-    def fromisoformat(cls, date_string: str) -> FhirDate:
-        """Construct a FhirDate from the output of FhirDate.isoformat()."""
-        for pat in (_y_pat, _ym_pat, _ymd_pat):
-            m = re.match(pat, date_string)
-            if m:
-                return FhirDate(*(int(p) for p in m.groups()))
-        msg = "Unknown date format."
-        raise ValueError(msg)
+    def fromisoformat(cls, date_string: str | Buffer, start: int = 0, end: int | None = None) -> FhirDate:
+        """Construct a FhirDate from the output of FhirDate.isoformat().
+
+        `date_string` may also be ASCII ``bytes``/``bytearray``/
+        ``memoryview``, and `start`/`end` select the value within it (as in
+        ``date_string[start:end]``), so a date can be parsed straight out of
+        a large buffer without slicing it first.
+
+        Returns a shared instance when :data:`parse_cache` is enabled.
+        """
+        if start or end is not None or not isinstance(date_string, str):
+            date_string = _as_str(date_string, start, end)
+        if parse_cache.maxsize:
+            return parse_cache.get_or_parse((cls, date_string), cls._fromisoformat, date_string)
+        return cls._fromisoformat(date_string)
+
+    @classmethod
+    def _fromisoformat(cls, date_string: str) -> FhirDate:
+        if intern_table.enabled and (shared := intern_table.get((cls, date_string))) is not None:
+            return shared  # ty: ignore[invalid-return-type]
+        return cls._from_fields(_parse(date_string, date_only=True), date_string)
+
+    @classmethod
+    def try_parse(cls, date_string: object, start: int = 0, end: int | None = None) -> FhirDate | ParseError:
+        """Like :meth:`fromisoformat`, but return a :class:`ParseError` on bad input.
+
+        Nothing is raised internally, so feeds where malformed values are
+        routine don't pay for an exception per bad value. Every
+        :class:`ParseError` is falsy, so the result can be checked just
+        like ``None``:
+
+        >>> FhirDate.try_parse("2021-02-30")
+        <ParseError.DAY_RANGE: 'day out of range'>
+        >>> bool(FhirDate.try_parse("20210215"))
+        False
+
+        Input other than a ``str`` or ASCII buffer is
+        :attr:`ParseError.MALFORMED` rather than a ``TypeError``.
+        """
+        if start or end is not None or not isinstance(date_string, str):
+            date_string = _as_str(date_string, start, end)
+        if parse_cache.maxsize and isinstance(date_string, str):
+            return parse_cache.get_or_parse((cls, date_string), cls._try_fromisoformat, date_string)
+        return cls._try_fromisoformat(date_string)
+
+    @classmethod
+    def _try_fromisoformat(cls, date_string: object) -> FhirDate | ParseError:
+        source = _as_str(date_string)
+        if not isinstance(source, str):
+            return ParseError.MALFORMED
+        if intern_table.enabled and (shared := intern_table.get((cls, source))) is not None:
+            return shared  # ty: ignore[invalid-return-type]
+        fields = _try_parse(source, date_only=True)
+        if isinstance(fields, ParseError):
+            return fields
+        return cls._from_fields(fields, source)
+
+    @classmethod
+    @overload
+    def parse_many(
+        cls, strings: Iterable[object], errors: Literal["raise", "skip"] = "raise", *, stream: Literal[False] = False
+    ) -> list[Self]: ...
+    @classmethod
+    @overload
+    def parse_many(
+        cls, strings: Iterable[object], errors: Literal["raise", "skip"] = "raise", *, stream: Literal[True]
+    ) -> Iterator[Self]: ...
+    @classmethod
+    @overload
+    def parse_many(
+        cls, strings: Iterable[object], errors: Literal["collect"], *, stream: Literal[False] = False
+    ) -> tuple[list[Self], list[ParseFailure]]: ...
+    @classmethod
+    @overload
+    def parse_many(
+        cls, strings: Iterable[object], errors: Literal["collect"], *, stream: Literal[True]
+    ) -> tuple[Iterator[Self], list[ParseFailure]]: ...
+    @classmethod
+    def parse_many(
+        cls, strings: Iterable[object], errors: ErrorPolicy = "raise", *, stream: bool = False
+    ) -> (
+        list[Self] | Iterator[Self] | tuple[list[Self], list[ParseFailure]] | tuple[Iterator[Self], list[ParseFailure]]
+    ):
+        """Parse a whole column of strings in one call.
+
+        Equivalent to calling :meth:`try_parse` on each string, but with the
+        per-call setup (method lookups, the :data:`parse_cache` check)
+        done once per batch.
+
+        >>> FhirDateTime.parse_many(["2021", "2021-03-15T10:30Z"])
+        [fhirdatetime.FhirDateTime(2021), fhirdatetime.FhirDateTime(2021, 3, 15, 10, 30, tzinfo=datetime.timezone.utc)]
+        >>> FhirDate.parse_many(["2021-03", "March 2021", "2021-02-30"], errors="collect")
+        ([fhirdatetime.FhirDate(2021, 3)], [(1, 'March 2021', <ParseError.MALFORMED: 'malformed'>), \
+(2, '2021-02-30', <ParseError.DAY_RANGE: 'day out of range'>)])
+
+        :param strings: The values to parse; anything that isn't a ``str``
+            is malformed.
+        :param errors: What to do with a value that doesn't parse:
+            ``"raise"`` the same exception :meth:`fromisoformat` would (with
+            a note giving its index), ``"skip"`` it, or ``"collect"`` it.
+        :param stream: Return an iterator that parses lazily instead of a
+            list.
+        :return: The parsed values, in input order. With
+            ``errors="collect"``, a ``(values, failures)`` pair, where each
+            failure is an ``(index, input, reason)`` tuple and ``reason`` is
+            a :class:`ParseError`. When streaming, ``failures`` fills up as
+            the iterator is consumed.
+        """
+        if errors not in _ERROR_POLICIES:
+            msg = f"errors must be one of {', '.join(_ERROR_POLICIES)}, not {errors!r}"
+            raise ValueError(msg)
+        parse = cls.try_parse if parse_cache.maxsize else cls._try_fromisoformat
+        failures: list[ParseFailure] = []
+        values = _parse_many(parse, cls.fromisoformat, strings, errors, failures)
+        if not stream:
+            values = list(values)
+        if errors == "collect":
+            return values, failures  # ty: ignore[invalid-return-type]
+        return values  # ty: ignore[invalid-return-type]
+
+    @classmethod
+    def _from_fields(cls, fields: Fields, source: str | None) -> FhirDate:
+        # Fields are already validated by the parser.
+        d = date.__new__(cls, 1, 1, 1)
+        _Date.__init__(d, *fields[:3])
+        d._source = source
+        if intern_table.enabled:
+            shared = d.intern()
+            if source is not None:
+                # Also filed under the string, so parsing it again can skip
+                # the parser.
+                intern_table.intern((cls, source), shared)
+            return shared
+        return d
 
     @staticmethod
     def from_native(other: date) -> FhirDate:
@@ -268,10 +590,62 @@ class FhirDate(_Date, date):
         Same rationale as :meth:`FhirDateTime.__reduce_ex__`: the inherited
         ``_Date.__reduce_ex__`` produces a `bytes` state blob shaped for
         `datetime.date.__setstate__`, which this class's `__init__` doesn't
-        understand. Round-trip through `isoformat` instead.
+        understand. Round-trip through `isoformat` instead (or the
+        :attr:`source` string, so that it survives the round trip).
         """
         del protocol
-        return self.__class__, (self.isoformat(),)
+        return self.__class__, (self._source or self.isoformat(),)
+
+    @classmethod
+    def lazy(cls, date_string: str | Buffer) -> Self:
+        """Create an instance that only parses `date_string` once it's needed.
+
+        Meant for values that are usually just passed through: the first
+        time a field, comparison, arithmetic, hash, or sort key needs the
+        value, `date_string` is parsed in place exactly as the constructor
+        would. Until then, :meth:`isoformat` and ``str()`` answer straight
+        from `date_string` whenever it's already in canonical form.
+
+        >>> dt = FhirDateTime.lazy("2021-03-15T10:30:00-05:00")
+        >>> dt.isoformat()  # Not parsed yet
+        '2021-03-15T10:30:00-05:00'
+        >>> dt.hour  # Parsed now
+        10
+
+        .. note:: Malformed input is only rejected when it's parsed, and an
+            unparsed canonical-looking string is written back as-is.
+        """
+        if not isinstance(date_string, str):
+            date_string = _as_str(date_string)
+            if not isinstance(date_string, str):
+                msg = f"lazy: argument must be str or ASCII bytes, not {type(date_string).__name__}"
+                raise TypeError(msg)
+        obj = cls.__new__(cls, date_string)
+        # Only the source is stored, and no fields. `_lazy` is the one thing
+        # kept in the instance `__dict__`, so only lazy instances pay for it.
+        obj._source = date_string
+        obj._lazy = True
+        return obj
+
+    if not TYPE_CHECKING:
+        # Hidden from type checkers so that misspelled attributes are still
+        # caught statically.
+
+        def __getattr__(self, name: str) -> object:
+            # Only reached for attributes the instance doesn't have: on an
+            # unparsed lazy instance, that's every field but `_source`.
+            if name.startswith("__") or not self._parse_lazy():
+                msg = f"{type(self).__name__!r} object has no attribute {name!r}"
+                raise AttributeError(msg)
+            return getattr(self, name)
+
+    def _parse_lazy(self) -> bool:
+        # Parse a lazy instance's source in place; False if nothing's pending.
+        if not self._lazy:
+            return False
+        type(self).__init__(self, self._source)  # ty: ignore[invalid-argument-type]
+        del self._lazy
+        return True
 
     def _replace_with(self, other: ComparableDateTypes) -> None:
         if not isinstance(other, (FhirDate, date)):
@@ -342,13 +716,15 @@ class FhirDate(_Date, date):
 
     @staticmethod
     @overload
-    def sort_key(attr_path: None = None) -> Callable[[FhirDate], SortableFields]: ...
+    def sort_key(
+        attr_path: None = None, *, missing: MissingPosition = "first"
+    ) -> Callable[[FhirDate], SortableFields]: ...
     @staticmethod
     @overload
-    def sort_key(attr_path: str) -> Callable[[object], SortableFields]: ...
+    def sort_key(attr_path: str, *, missing: MissingPosition = "first") -> Callable[[object], SortableFields]: ...
     @staticmethod
     def sort_key(
-        attr_path: str | None = None,
+        attr_path: str | None = None, *, missing: MissingPosition = "first"
     ) -> Callable[[FhirDate], SortableFields] | Callable[[object], SortableFields]:
         """Create a function appropriate for use as a sorting key.
 
@@ -382,42 +758,144 @@ class FhirDate(_Date, date):
 
         In this example, ``sorted()`` passes each item in ``goal_list`` to the
         ``sort_key`` static method, which  gets the ``startDate`` attribute of
-        the goal. Finally, the year, month, and day are returned to
-        ``sorted()``, which does the appropriate sorting on those values.
+        the goal. Finally, a single integer encoding the date (and its
+        precision) is returned to ``sorted()`` to sort on.
+
+        The path works on resources parsed from JSON, too, following keys
+        rather than attributes, and it can index into lists. The value it
+        leads to may then be a FHIR string, which is parsed:
+
+        >>> patients = [{"birthDate": "1980-03"}, {}, {"birthDate": "1975"}]
+        >>> sorted(patients, key=FhirDate.sort_key("birthDate", missing="last"))
+        [{'birthDate': '1975'}, {'birthDate': '1980-03'}, {}]
 
         :param attr_path: A attribute "path" to the :class:`FhirDate` object to
-            be used as the basis for sorting, such as ``"startDate"``.
+            be used as the basis for sorting, such as ``"startDate"`` or
+            ``"identifier[0].period.start"``. It's parsed only once.
+        :param missing: Where to sort items whose path leads to no value (a
+            ``None``, missing key or too-short list along the way):
+            ``"first"``, ``"last"``, or ``"raise"`` for a :class:`TypeError`.
         :return: A function identifying values to use for sorting.
         """
-        i = itemgetter(_IDX_YEAR, _IDX_MONTH, _IDX_DAY)
         if attr_path is None:
-            return i
-
-        def caller(obj: object) -> SortableFields:
-            for attr in attr_path.split("."):
-                obj = getattr(obj, attr)
-            if not isinstance(obj, FhirDate):
-                msg = f"attr_path must lead to an instance of FhirDate, not {type(obj).__name__}"
-                raise TypeError(msg)
-            return i(obj)
-
-        return caller
+            return _date_sort_key
+        return _path_key(attr_path, _date_sort_key, FhirDate, missing)
 
     def _cmp(self, other: ComparableDateTypes) -> int:
         if not isinstance(other, (FhirDate, date)):
             msg = f"Cannot compare FhirDate and {type(other).__name__}"
             raise TypeError(msg)
 
-        for f in DATE_FIELDS:
-            my = getattr(self, f, None)
-            ot = getattr(other, f, None)
-            if None in {my, ot}:
-                return 0
-            c = _cmp(my, ot)
-            if c != 0:
-                return c
-        # Means all fields are the same and non-None
-        return 0
+        return _cmp_bounds(self, other)
+
+    @property
+    def precision(self) -> Precision:
+        """How much of this value is populated, from year through time."""
+        if self._month is None:
+            return Precision.YEAR
+        if self._day is None:
+            return Precision.MONTH
+        if self._hour is None:
+            return Precision.DAY
+        return Precision.TIME
+
+    def exact_key(self) -> int:
+        """Return an integer identifying this exact value.
+
+        Unlike ``==`` (and so ``hash()``), which treat ``FhirDate(2021)`` as
+        equal to every date in 2021, two values have the same key only if
+        they have the same precision and denote the same interval. Values
+        with a time are keyed by their UTC instant, so the same instant at
+        different offsets shares a key. :class:`FhirExactSet` and
+        :class:`FhirExactDict` hash on this key. It's the value's
+        ``sort_key(by="instant")``.
+        """
+        return _instant_sort_key(self)
+
+    def intern(self) -> Self:
+        """Return the shared instance for this exact value, from :data:`intern_table`.
+
+        That's this instance itself the first time its value is interned,
+        and that first instance for every equal value after it, for as
+        long as it's still referenced somewhere. "Equal" is stricter than
+        ``==`` here: same type and fields and, for a :class:`FhirDateTime`,
+        the same tzinfo and, if parsed from a string, the same
+        :attr:`source` string (so the offset keeps its spelling). A
+        :class:`FhirDate`'s source isn't part of it, so the shared date's
+        :attr:`source` may be ``None`` or differ from this one's.
+
+        >>> a = FhirDate("2021-03-15").intern()
+        >>> FhirDate(2021, 3, 15).intern() is a
+        True
+
+        Also callable as ``FhirDate.intern(x)``.
+        """
+        return intern_table.intern(self._intern_key(), self)
+
+    def _intern_key(self) -> Hashable:
+        # A date has a single spelling, so parsed and constructed values
+        # share a key.
+        return type(self), self._year, self._month, self._day
+
+    def relation(self, other: ComparableDateTypes) -> Relation:
+        """Return how this value relates to `other`, in a single call.
+
+        Each value stands for the interval it implies: ``FhirDate(2021)``
+        is all of 2021, while a value with a time is the microsecond it
+        names. Unlike ``<``/``==``, which treat any containment as "equal",
+        this says *definitely* before or after, or how the intervals nest:
+
+        >>> FhirDate(2021).relation(FhirDate(2021, 3))
+        <Relation.CONTAINS: 'contains'>
+        >>> FhirDate(2021, 3).relation(FhirDate(2021))
+        <Relation.WITHIN: 'within'>
+        >>> FhirDate(2021, 3).relation(FhirDate(2021, 4, 1))
+        <Relation.BEFORE: 'before'>
+
+        Offsets are handled just like the comparison operators handle them.
+        """
+        if not isinstance(other, (FhirDate, date)):
+            msg = f"Cannot compare {type(self).__name__} and {type(other).__name__}"
+            raise TypeError(msg)
+        lo, hi, olo, ohi = _aligned_bounds(self, other)
+        if hi <= olo:
+            return Relation.BEFORE
+        if lo >= ohi:
+            return Relation.AFTER
+        if lo == olo and hi == ohi:
+            return Relation.EQUAL
+        if lo <= olo and hi >= ohi:
+            return Relation.CONTAINS
+        if lo >= olo and hi <= ohi:
+            return Relation.WITHIN
+        return Relation.OVERLAPS
+
+    def lower_bound(self) -> datetime:
+        """Return the first instant of the interval this value implies.
+
+        FHIR search treats every value as the interval its precision
+        implies, so ``FhirDate(2021, 3)`` is ``[2021-03-01T00:00,
+        2021-04-01T00:00)``, while a value with a time is the microsecond it
+        names. The bounds of a value with a time keep its tzinfo; those of
+        a value without one are naive.
+
+        >>> FhirDate(2021, 3).lower_bound()
+        datetime.datetime(2021, 3, 1, 0, 0)
+        """
+        lo, _, _, tz = _bounds(self)
+        return datetime.min.replace(tzinfo=tz) + timedelta(microseconds=lo - _US_PER_DAY)
+
+    def upper_bound(self) -> datetime:
+        """Return the last instant of the interval this value implies.
+
+        That's the microsecond before the interval ends, as its exclusive
+        end wouldn't fit in a :class:`datetime` for the year 9999.
+
+        >>> FhirDate(2021, 3).upper_bound()
+        datetime.datetime(2021, 3, 31, 23, 59, 59, 999999)
+        """
+        _, hi, _, tz = _bounds(self)
+        return datetime.min.replace(tzinfo=tz) + timedelta(microseconds=hi - 1 - _US_PER_DAY)
 
     def __eq__(self, other: object) -> bool:
         # Unlike ordering comparisons, == must accept arbitrary objects and
@@ -425,11 +903,16 @@ class FhirDate(_Date, date):
         # operations like `x in some_dict`/`x in some_set` crash instead of
         # just returning False when `x` happens to collide with a
         # FhirDate's hash bucket.
+        if other is self:
+            # Cheap with interned values, which are often the same object.
+            return True
         if not isinstance(other, (FhirDate, date)):
             return NotImplemented
         return self._cmp(other) == 0
 
     def __ne__(self, other: object) -> bool:
+        if other is self:
+            return False
         if not isinstance(other, (FhirDate, date)):
             return NotImplemented
         return self._cmp(other) != 0
@@ -502,13 +985,37 @@ class FhirDateTime(FhirDate, _DateTime, datetime):
     own :meth:`_cmp` override polymorphically.
     """
 
+    # Everything lives in slots, so the `__dict__` inherited from FhirDate is
+    # never allocated (except by `lazy()`), more than halving each instance.
+    # FhirDate can't do the same: slots of its own would clash with
+    # `datetime`'s C layout here.
+    __slots__ = (
+        "_bounds",
+        "_day",
+        "_fold",
+        "_hashcode",
+        "_hour",
+        "_microsecond",
+        "_minute",
+        "_month",
+        "_second",
+        "_source",
+        "_tzinfo",
+        "_utcoffset",
+        "_year",
+    )
+
     def __new__(cls, year: YearArg, *_: object, **__: object) -> Self:
         """Start creating FhirDateTime instance."""
         # Give datetime.__new__() an arbitrary date to pass its value checks.
         # Must call datetime.__new__ directly rather than super().__new__:
         # FhirDate is next in the MRO and its own __new__ would route through
         # date.__new__ instead, producing a plain date-shaped instance.
-        return datetime.__new__(cls, 1, 1, 1)
+        self = datetime.__new__(cls, 1, 1, 1)
+        # Slots have no class-level default to fall back on, unlike FhirDate.
+        self._source = self._bounds = None
+        self._utcoffset = _UNCACHED
+        return self
 
     def __init__(  # noqa: PLR0913, PLR0917
         self,
@@ -539,9 +1046,13 @@ class FhirDateTime(FhirDate, _DateTime, datetime):
         if isinstance(year, (datetime, date)):
             self._replace_with(year)
             return
-        if isinstance(year, str):
-            dt = FhirDateTime.fromisoformat(year)
-            self._replace_with(dt)
+        if isinstance(year, _PARSEABLE_TYPES):
+            source = _as_str(year)
+            if parse_cache.maxsize:
+                self._replace_with(FhirDateTime.fromisoformat(source))
+            else:
+                self._init_from_fields(_parse(source))
+            self._source = source
             return
 
         # Check values are within acceptable ranges
@@ -570,77 +1081,145 @@ class FhirDateTime(FhirDate, _DateTime, datetime):
         terms of the time to include. Valid options are 'auto', 'hours',
         'minutes', 'seconds', 'milliseconds' and 'microseconds'.
         """
-        if None in {self._hour, self._minute}:
+        source = self._source
+        if self._lazy and timespec == "auto" and source is not None and _is_canonical(source):
+            # Not parsed yet.
+            return source if sep == "T" or len(source) <= _LEN_YMD else source[:_LEN_YMD] + sep + source[_LEN_YMD + 1 :]
+        hour = self._hour
+        minute = self._minute
+        if hour is None or minute is None:
             return FhirDate.isoformat(self)
 
-        fmt = _ymd_format + sep + _format_time(self._hour, self._minute, self._second, self._microsecond, timespec)
-        s = fmt.format(**self.__dict__)
-        off = self.utcoffset()
-        tz = _format_offset(off)
-        if tz:
-            s += tz
+        if timespec == "auto":
+            # By far the most common case, so it skips _format_time's
+            # format-string lookup. Trailing microseconds are omitted when 0.
+            us = self._microsecond
+            if us:
+                time = f"{hour:02d}:{minute:02d}:{self._second:02d}.{us:06d}"
+            else:
+                time = f"{hour:02d}:{minute:02d}:{self._second:02d}"
+        else:
+            time = _format_time(hour, minute, self._second, self._microsecond, timespec)
+        s = f"{self._year:04d}-{self._month:02d}-{self._day:02d}{sep}{time}"
+        tz = self._tzinfo
+        if tz is None:
+            return s
+        key = tz if type(tz) is timezone else self.utcoffset()
+        suffix = _offset_suffixes.get(key)
+        if suffix is None:
+            suffix = _format_offset(self.utcoffset())
+            if key is not None and len(suffix) == _LEN_OFFSET_SUFFIX:
+                _offset_suffixes[key] = suffix
+        return s + suffix
+
+    def utcoffset(self) -> timedelta | None:
+        """Return the timezone offset as timedelta, positive east of UTC.
+
+        Worked out once per instance and cached, since values are immutable
+        once constructed. For a tzinfo like :class:`zoneinfo.ZoneInfo`,
+        that's the expensive part of comparing, formatting and subtracting
+        values: each call builds a throwaway stdlib ``datetime`` to ask it.
+        """
+        offset = self._utcoffset
+        if offset is _UNCACHED:
+            tz = self._tzinfo
+            # A `timezone`'s offset doesn't depend on the value, so skip
+            # building a datetime to ask it.
+            offset = tz.utcoffset(None) if type(tz) is timezone else _DateTime.utcoffset(self)
+            self._utcoffset = offset
+        return offset
+
+    def to_fhir(self) -> str:
+        """Return this value as a FHIR ``dateTime`` string.
+
+        That's :attr:`source` when this value was parsed from a string,
+        without any formatting work, so re-serializing it reproduces the
+        input exactly. Otherwise, it's :meth:`isoformat`.
+        """
+        source = self._source
+        if source is not None:
+            return source
+        return self.isoformat()
 
-        return s
+    @classmethod
+    def fromisoformat(cls, date_string: str | Buffer, start: int = 0, end: int | None = None) -> FhirDateTime:
+        """Construct a FhirDateTime from the output of FhirDateTime.isoformat().
+
+        Accepts any FHIR ``dateTime``: year, year-month, or full date, with
+        an optional ``hh:mm[:ss[.f...]]`` time and a ``Z`` or ``+hh:mm``/
+        ``-hh:mm`` offset. FHIR's grammar explicitly allows a leap second
+        (``:60``), but this library never produces one, so it's normalized
+        to ``:59`` on parse.
+
+        `date_string` may also be ASCII ``bytes``/``bytearray``/
+        ``memoryview``, and `start`/`end` select the value within it (as in
+        ``date_string[start:end]``), so a date can be parsed straight out of
+        a large buffer without slicing it first.
+
+        Returns a shared instance when :data:`parse_cache` is enabled.
+        """
+        if start or end is not None or not isinstance(date_string, str):
+            date_string = _as_str(date_string, start, end)
+        if parse_cache.maxsize:
+            return parse_cache.get_or_parse((cls, date_string), cls._fromisoformat, date_string)
+        return cls._fromisoformat(date_string)
 
     @classmethod
-    def fromisoformat(cls, date_string: str) -> FhirDateTime:
-        """Construct a FhirDateTime from the output of FhirDateTime.isoformat()."""
-        # FHIR's dateTime grammar explicitly allows a leap second (:60), but
-        # this library never produces one (isoformat()/construction still
-        # cap at :59) -- per FHIR's own guidance ("applications reading
-        # times SHOULD accept and handle leap seconds gracefully, and
-        # applications producing them MAY choose to avoid encoding leap
-        # seconds"), normalize it to :59 on parse rather than rejecting or
-        # attempting to store/round-trip it distinctly.
-        date_string = _leap_second_pat.sub(r"\g<1>59\2", date_string)
-
-        # Check for shorter formats first. Handled one pattern at a time
-        # (rather than looping and unpacking `*groups`) so each call site
-        # has a fixed, statically-checkable arity.
-        m = re.match(_y_pat, date_string)
-        if m:
-            return FhirDateTime(int(m[1]))
-        m = re.match(_ym_pat, date_string)
-        if m:
-            return FhirDateTime(int(m[1]), int(m[2]))
-        m = re.match(_ymd_pat, date_string)
-        if m:
-            return FhirDateTime(int(m[1]), int(m[2]), int(m[3]))
-
-        try:
-            # FhirDate is next in the MRO and its own fromisoformat only
-            # handles the y/ym/ymd patterns already tried above (and would
-            # just re-raise ValueError) — skip straight to _DateTime's full
-            # ISO-datetime parser. See super()'s docs on __mro__ if this
-            # explicit two-arg form is surprising:
-            # https://docs.python.org/3/library/functions.html#super
-            return super(FhirDate, cls).fromisoformat(date_string)
-        except (ValueError, IndexError):
-            pass
-
-        for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
-            try:
-                # Parse via the real stdlib datetime, not cls.strptime: the
-                # latter would construct an intermediate *naive* FhirDateTime
-                # before tzinfo is attached, which now raises on its own
-                # (FHIR requires a timezone whenever a time is present).
-                # Build the final, already-aware instance in one shot instead.
-                parsed = datetime.strptime(date_string, fmt)  # noqa: DTZ007
-            except ValueError:
-                continue
-            return cls(
-                parsed.year,
-                parsed.month,
-                parsed.day,
-                parsed.hour,
-                parsed.minute,
-                parsed.second,
-                parsed.microsecond,
-                tzinfo=UTC,
-            )
-
-        msg = f"Invalid isoformat string: {date_string!r}"
-        raise ValueError(msg)
+    def _fromisoformat(cls, date_string: str) -> FhirDateTime:
+        if intern_table.enabled and (shared := intern_table.get((cls, date_string))) is not None:
+            return shared  # ty: ignore[invalid-return-type]
+        return cls._from_fields(_parse(date_string), date_string)
+
+    @classmethod
+    def try_parse(cls, date_string: object, start: int = 0, end: int | None = None) -> FhirDateTime | ParseError:
+        """Like :meth:`fromisoformat`, but return a :class:`ParseError` on bad input.
+
+        Nothing is raised internally, so feeds where malformed values are
+        routine don't pay for an exception per bad value. Every
+        :class:`ParseError` is falsy, so the result can be checked just
+        like ``None``:
+
+        >>> FhirDateTime.try_parse("2021-03-15T20:54:00")
+        <ParseError.TZ_REQUIRED: 'time without timezone'>
+        >>> if dt := FhirDateTime.try_parse("2021-03-15T20:54:00Z"):
+        ...     dt.hour
+        20
+
+        Input other than a ``str`` or ASCII buffer is
+        :attr:`ParseError.MALFORMED` rather than a ``TypeError``.
+        """
+        if start or end is not None or not isinstance(date_string, str):
+            date_string = _as_str(date_string, start, end)
+        if parse_cache.maxsize and isinstance(date_string, str):
+            return parse_cache.get_or_parse((cls, date_string), cls._try_fromisoformat, date_string)
+        return cls._try_fromisoformat(date_string)
+
+    @classmethod
+    def _try_fromisoformat(cls, date_string: object) -> FhirDateTime | ParseError:
+        source = _as_str(date_string)
+        if not isinstance(source, str):
+            return ParseError.MALFORMED
+        if intern_table.enabled and (shared := intern_table.get((cls, source))) is not None:
+            return shared  # ty: ignore[invalid-return-type]
+        fields = _try_parse(source)
+        if isinstance(fields, ParseError):
+            return fields
+        return cls._from_fields(fields, source)
+
+    @classmethod
+    def _from_fields(cls, fields: Fields, source: str | None) -> FhirDateTime:
+        dt = cls.__new__(cls, 1)  # Just an arbitrary year
+        dt._init_from_fields(fields)
+        dt._source = source
+        if intern_table.enabled:
+            return dt.intern()
+        return dt
+
+    def _init_from_fields(self, fields: Fields) -> None:
+        # Fields are already validated by the parser; skip straight to
+        # _DateTime.__init__ rather than re-checking them via cls(...).
+        year, month, day, hour, minute, second, microsecond, offset, _ = fields
+        _DateTime.__init__(self, year, month, day, hour, minute, second, microsecond, _offset_tzinfo(offset))
 
     @staticmethod
     def from_native(other: datetime | date) -> FhirDateTime:
@@ -705,10 +1284,12 @@ class FhirDateTime(FhirDate, _DateTime, datetime):
         instead, since `fromisoformat` is already guaranteed to reconstruct
         any value `isoformat` can produce. Note this loses `fold`, which
         `isoformat` doesn't encode -- an acceptable tradeoff since FHIR data
-        has no concept of DST-transition ambiguity.
+        has no concept of DST-transition ambiguity. Values parsed from a
+        string round-trip through their :attr:`source` instead, so that it
+        survives too.
         """
         del protocol
-        return self.__class__, (self.isoformat(),)
+        return self.__class__, (self._source or self.isoformat(),)
 
     def _replace_with(self, other: ComparableDateTimeTypes) -> None:
         if not isinstance(other, (FhirDateTime, date, datetime)):
@@ -755,23 +1336,27 @@ class FhirDateTime(FhirDate, _DateTime, datetime):
 
     @staticmethod
     @overload
-    def sort_key(attr_path: None = None) -> Callable[[FhirDateTime], SortableFields]: ...
+    def sort_key(
+        attr_path: None = None, *, missing: MissingPosition = "first", by: SortBy = "fields"
+    ) -> Callable[[FhirDateTime], SortableFields]: ...
     @staticmethod
     @overload
-    def sort_key(attr_path: str) -> Callable[[object], SortableFields]: ...
+    def sort_key(
+        attr_path: str, *, missing: MissingPosition = "first", by: SortBy = "fields"
+    ) -> Callable[[object], SortableFields]: ...
     @staticmethod
     def sort_key(  # ty: ignore[invalid-method-override]
-        attr_path: str | None = None,
+        attr_path: str | None = None, *, missing: MissingPosition = "first", by: SortBy = "fields"
     ) -> Callable[[FhirDateTime], SortableFields] | Callable[[object], SortableFields]:
         """Create a function appropriate for use as a sorting key.
 
         This narrows :meth:`FhirDate.sort_key`'s ``Callable[[FhirDate], ...]``
         return type to ``Callable[[FhirDateTime], ...]``, which is technically
-        an LSP violation -- but it reflects a real runtime restriction, not
-        just a typing choice: the returned callable's ``attr_path`` form
-        needs hour/minute/second/microsecond, so it genuinely rejects a
-        plain (non-``FhirDateTime``) ``FhirDate`` via the ``isinstance``
-        check below, same as the type says.
+        an LSP violation, kept so existing annotations still check. At
+        runtime, the key also takes a plain :class:`FhirDate`, whether given
+        directly or found at the end of `attr_path`: it sorts like the
+        :class:`FhirDateTime` with the same fields, at the start of its year,
+        month or day and before any time within it.
 
         .. important:: When there is ambiguity due to one :class:`FhirDateTime`
             object storing less-granular data than another (e.g.,
@@ -804,35 +1389,66 @@ class FhirDateTime(FhirDate, _DateTime, datetime):
         In this example, ``sorted()`` passes each item in ``care_plan_list`` to
         the ``sort_key`` static method, which first gets the ``period``
         attribute of the item, then gets the ``start`` attribute of the period.
-        Finally, the year, month, day, and other values are returned to
-        ``sorted()``, which does the appropriate sorting on those values.
+        Finally, a single integer encoding the local date and time (and its
+        precision) is returned to ``sorted()`` to sort on. The UTC offset is
+        ignored, just as it is by comparing the values' fields one by one.
+
+        To sort values from sources in different timezones by when they
+        happened instead, pass ``by="instant"``. Each value is then keyed by
+        the UTC instant it starts at, so ``10:00-05:00`` sorts after
+        ``12:00+00:00``. A value without a time has no offset to apply, so it's
+        placed by its local start (``FhirDateTime(2021, 4, 12)`` at
+        ``2021-04-12T00:00:00Z``), and among values starting at the same
+        instant, less precise ones sort first:
+
+        >>> values = [FhirDateTime("2021-04-12T10:00:00-05:00"), FhirDateTime("2021-04-12T12:00:00Z")]
+        >>> [v.isoformat() for v in sorted(values, key=FhirDateTime.sort_key(by="instant"))]
+        ['2021-04-12T12:00:00+00:00', '2021-04-12T10:00:00-05:00']
+
+        As with :meth:`FhirDate.sort_key`, the path may also follow mapping
+        keys and list indexes, as in ``"identifier[0].period.end"``, and lead
+        to a FHIR string rather than a :class:`FhirDateTime`.
 
         :param attr_path: A attribute "path" to the :class:`FhirDateTime`
-            object to be used as the basis for sorting, such as
-            ``"period.start"``.
+            (or :class:`FhirDate`) object to be used as the basis for
+            sorting, such as ``"period.start"``. It's parsed only once.
+        :param missing: Where to sort items whose path leads to no value (a
+            ``None``, missing key or too-short list along the way):
+            ``"first"``, ``"last"``, or ``"raise"`` for a :class:`TypeError`.
+        :param by: What to order values by: ``"fields"``, their local date and
+            time, or ``"instant"``, the UTC instant they start at.
         :return: A function identifying values to use for sorting.
         """
-        i = itemgetter(
-            _IDX_YEAR,
-            _IDX_MONTH,
-            _IDX_DAY,
-            _IDX_HOUR,
-            _IDX_MINUTE,
-            _IDX_SECOND,
-            _IDX_MICROSECOND,
-        )
+        if by == "fields":
+            key = _sort_key
+        elif by == "instant":
+            key = _instant_sort_key
+        else:
+            msg = f"by must be 'fields' or 'instant', not {by!r}"
+            raise ValueError(msg)
         if attr_path is None:
-            return i
-
-        def caller(obj: object) -> SortableFields:
-            for attr in attr_path.split("."):
-                obj = getattr(obj, attr)
-            if not isinstance(obj, FhirDateTime):
-                msg = f"attr_path must lead to an instance of FhirDateTime, not {type(obj).__name__}"
-                raise TypeError(msg)
-            return i(obj)
-
-        return caller
+            return key
+        return _path_key(attr_path, key, FhirDateTime, missing)
+
+    def _intern_key(self) -> Hashable:
+        # Parsed values are keyed by their source, which fixes every field
+        # and the offset's spelling (so parsing can look it up before
+        # parsing anything).
+        source = self._source
+        if source is not None:
+            return type(self), source
+        return (
+            type(self),
+            self._year,
+            self._month,
+            self._day,
+            self._hour,
+            self._minute,
+            self._second,
+            self._microsecond,
+            self._tzinfo,
+            self._fold,
+        )
 
     def _cmp(self, other: ComparableDateTimeTypes, allow_mixed: bool = False) -> int:
         # allow_mixed is accepted (but unused) purely to match the base class's
@@ -844,38 +1460,7 @@ class FhirDateTime(FhirDate, _DateTime, datetime):
             msg = f"Cannot compare FhirDateTime and {type(other).__name__}"
             raise TypeError(msg)
 
-        if not isinstance(other, (FhirDateTime, datetime)):
-            # A plain `date` has no tzinfo, so it can never disagree with
-            # self on UTC offset.
-            base_compare = True
-        else:
-            mytz = self.tzinfo
-            ottz = other.tzinfo
-            if mytz is ottz or None in {mytz, ottz}:
-                base_compare = True
-            else:
-                myoff = self.utcoffset()
-                otoff = other.utcoffset()
-                base_compare = myoff == otoff
-
-        if base_compare:
-            for f in DATE_FIELDS + TIME_FIELDS:
-                my = getattr(self, f, None)
-                ot = getattr(other, f, None)
-                if None in {my, ot}:
-                    return 0
-                c = _cmp(my, ot)
-                if c != 0:
-                    return c
-            # Means all fields are the same and non-None
-            return 0
-
-        # If we've reached this point, self has time values and other must be a
-        # FhirDateTime or datetime object.
-        diff = self - other
-        if diff.days < 0:
-            return -1
-        return 1 if diff else 0
+        return _cmp_bounds(self, other)
 
     def __str__(self) -> str:
         """Convert to string, for str().
@@ -0,0 +1,284 @@
+"""Columnar storage for large numbers of FHIR date/dateTime values.
+
+A million :class:`FhirDateTime` objects take a couple of hundred megabytes
+and give the garbage collector a million more objects to track. These
+arrays keep each value in typed :mod:`array` columns instead, one entry
+per value, and only build an object for the elements that are indexed:
+
+- ``micros`` (``array('q')``): where the value's interval starts, in
+  microseconds since 1970-01-01. That's the UTC instant for a value with
+  a time, and the local (offset-free) start otherwise, just like
+  :meth:`FhirDate.exact_key`.
+- ``precisions`` (``array('b')``): the value's :class:`Precision`.
+- ``offsets`` (``array('h')``, :class:`FhirDateTimeArray` only): the UTC
+  offset in minutes, or :attr:`FhirDateTimeArray.NO_OFFSET` for a value
+  without a time.
+
+Each column supports the buffer protocol, so it can be handed to
+:func:`memoryview`, ``numpy.frombuffer`` and the like without copying.
+"""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+from array import array
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import TYPE_CHECKING, ClassVar, Self, TypeVar, overload
+
+from ._datetime import _days_before_month, _days_before_year
+from ._keys import _DAY, _EPOCH_DAYS, _MONTH, _TIME, _US_PER_DAY, _YEAR
+from ._parser import Precision, _parse
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from . import FhirDate, FhirDateTime
+    from ._parser import Buffer, Fields
+
+T = TypeVar("T", bound="FhirDate")
+
+_US_PER_HOUR = 3_600_000_000
+_US_PER_MINUTE = 60_000_000
+_US_PER_SECOND = 1_000_000
+
+
+def _fields_of(value: date, date_only: bool) -> Fields:
+    # `value`'s `Fields`, as the parser would produce them. Works for
+    # FhirDate/FhirDateTime and the stdlib types alike. With `date_only`,
+    # any time (and so the offset it requires) is ignored.
+    year = value.year
+    month = value.month
+    day = value.day
+    if month is None:
+        precision = _YEAR
+    elif day is None:
+        precision = _MONTH
+    elif date_only or not isinstance(value, datetime) or value.hour is None:
+        precision = _DAY
+    else:
+        offset = value.utcoffset()
+        if offset is None:
+            msg = "FHIR requires a timezone when a time is given"
+            raise ValueError(msg, value)
+        return (
+            year,
+            month,
+            day,
+            value.hour,
+            value.minute,
+            value.second,
+            value.microsecond,
+            offset.total_seconds(),
+            _TIME,
+        )
+    return year, month, day, None, None, 0, 0, None, precision
+
+
+def _days(year: int, month: int | None, day: int | None) -> int:
+    # Days from 1970-01-01 to the first day `year`/`month`/`day` covers.
+    days = _days_before_year(year) - _EPOCH_DAYS
+    if month is not None:
+        days += _days_before_month(year, month)
+        if day is not None:
+            days += day - 1
+    return days
+
+
+def _date_fields(micros: int, precision: int) -> Fields:
+    # Inverse of `_days()`, from a `micros` entry, as `Fields`.
+    d = date.fromordinal(micros // _US_PER_DAY + _EPOCH_DAYS + 1)
+    month = d.month if precision >= _MONTH else None
+    day = d.day if precision >= _DAY else None
+    return d.year, month, day, None, None, 0, 0, None, Precision(precision)
+
+
+class _FhirArray(Sequence[T]):
+    # What FhirDateArray and FhirDateTimeArray share: the `micros` and
+    # `precisions` columns, growing, slicing and comparing. Subclasses
+    # convert between `Fields` and columns, and build the elements.
+
+    __slots__ = ("micros", "precisions")
+
+    # Every column, for slicing and comparing.
+    _columns: ClassVar[tuple[str, ...]] = ("micros", "precisions")
+    # Whether `from_strings()` rejects strings with a time, like the
+    # element class's `fromisoformat()` does.
+    _date_only: ClassVar[bool]
+
+    def __init__(self, values: Iterable[date] = ()) -> None:
+        """Create an array holding `values`: any FHIR or stdlib dates/datetimes."""
+        self.micros = array("q")
+        self.precisions = array("b")
+        self.extend(values)
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str | Buffer]) -> Self:
+        """Parse `strings` straight into a new array, without building any objects.
+
+        Accepts the same strings (or ASCII buffers) as the element class's
+        ``fromisoformat()``, and raises the same :class:`ValueError` for
+        the first one that doesn't parse.
+        """
+        arr = cls()
+        append = arr._append_fields
+        date_only = cls._date_only
+        for s in strings:
+            append(_parse(s, date_only=date_only))
+        return arr
+
+    def append(self, value: date) -> None:
+        """Add `value` to the end of the array."""
+        self._append_fields(_fields_of(value, self._date_only))
+
+    def extend(self, values: Iterable[date]) -> None:
+        """Add every one of `values` to the end of the array."""
+        append = self._append_fields
+        date_only = self._date_only
+        for value in values:
+            append(_fields_of(value, date_only))
+
+    # Declared abstract so a subclass missing either can't be instantiated.
+    @abstractmethod
+    def _append_fields(self, fields: Fields) -> None: ...
+
+    @abstractmethod
+    def _item(self, i: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+    @overload
+    def __getitem__(self, index: slice) -> Self: ...
+    def __getitem__(self, index: int | slice) -> T | Self:
+        if isinstance(index, slice):
+            arr = type(self)()
+            for name in self._columns:
+                setattr(arr, name, getattr(self, name)[index])
+            return arr
+        n = len(self.micros)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            msg = f"{type(self).__name__} index out of range"
+            raise IndexError(msg)
+        return self._item(index)
+
+    def __len__(self) -> int:
+        return len(self.micros)
+
+    def __eq__(self, other: object) -> bool:
+        # Compares the stored values exactly, not with FHIR's ambiguous ==.
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._columns)
+
+    __hash__ = None  # Mutable, like list
+
+    def __buffer__(self, flags: int, /) -> memoryview:
+        """Expose the ``micros`` column to the buffer protocol (Python 3.12+)."""
+        del flags
+        return memoryview(self.micros)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+class FhirDateArray(_FhirArray["FhirDate"]):
+    """A compact, list-like array of :class:`FhirDate` values.
+
+    Stores 9 bytes per value in ``micros`` and ``precisions`` columns (see
+    the module docs). Indexing builds a :class:`FhirDate` for just that
+    element; slicing returns another array. A value with a time is stored
+    as its local date, just as ``FhirDate(dt)`` would keep it.
+
+    >>> a = FhirDateArray.from_strings(["2021", "2021-03-15"])
+    >>> a[1]
+    fhirdatetime.FhirDate(2021, 3, 15)
+    >>> list(a.precisions)
+    [0, 2]
+    """
+
+    __slots__ = ()
+
+    _date_only = True
+
+    def _append_fields(self, fields: Fields) -> None:
+        year, month, day, *_, precision = fields
+        self.micros.append(_days(year, month, day) * _US_PER_DAY)
+        self.precisions.append(min(precision, _DAY))
+
+    def _item(self, i: int) -> FhirDate:
+        from . import FhirDate  # noqa: PLC0415 (circular import)
+
+        return FhirDate._from_fields(_date_fields(self.micros[i], self.precisions[i]), None)
+
+
+class FhirDateTimeArray(_FhirArray["FhirDateTime"]):
+    """A compact, list-like array of :class:`FhirDateTime` values.
+
+    Stores 11 bytes per value in ``micros``, ``precisions`` and
+    ``offsets`` columns (see the module docs). Indexing builds a
+    :class:`FhirDateTime` for just that element; slicing returns another
+    array.
+
+    Only the UTC offset is kept, in whole minutes: an element comes back
+    with a fixed-offset ``timezone`` even if it went in with a
+    :class:`zoneinfo.ZoneInfo`, and a value whose offset isn't a whole
+    number of minutes is rejected with :class:`ValueError`.
+
+    >>> a = FhirDateTimeArray.from_strings(["2021-03", "2021-03-15T10:30:00-05:00"])
+    >>> a[1].isoformat()
+    '2021-03-15T10:30:00-05:00'
+    >>> a.micros[1], a.offsets[1]
+    (1615822200000000, -300)
+    """
+
+    __slots__ = ("offsets",)
+
+    NO_OFFSET: ClassVar[int] = -0x8000
+    """The ``offsets`` entry for a value without a time (so without an offset)."""
+
+    _columns = ("micros", "precisions", "offsets")
+    _date_only = False
+
+    def __init__(self, values: Iterable[date] = ()) -> None:
+        """Create an array holding `values`: any FHIR or stdlib dates/datetimes."""
+        self.offsets = array("h")
+        super().__init__(values)
+
+    def _append_fields(self, fields: Fields) -> None:
+        year, month, day, hour, minute, second, microsecond, offset, precision = fields
+        if hour is None or minute is None or offset is None:
+            self.micros.append(_days(year, month, day) * _US_PER_DAY)
+            self.precisions.append(precision)
+            self.offsets.append(self.NO_OFFSET)
+            return
+        minutes, rest = divmod(offset, 60)
+        if rest:
+            msg = "offset must be a whole number of minutes"
+            raise ValueError(msg, offset)
+        minutes = int(minutes)
+        self.micros.append(
+            _days(year, month, day) * _US_PER_DAY
+            + hour * _US_PER_HOUR
+            + (minute - minutes) * _US_PER_MINUTE
+            + second * _US_PER_SECOND
+            + microsecond
+        )
+        self.precisions.append(precision)
+        self.offsets.append(minutes)
+
+    def _item(self, i: int) -> FhirDateTime:
+        from . import FhirDateTime  # noqa: PLC0415 (circular import)
+
+        minutes = self.offsets[i]
+        if minutes == self.NO_OFFSET:
+            fields = _date_fields(self.micros[i], self.precisions[i])
+        else:
+            days, us = divmod(self.micros[i] + minutes * _US_PER_MINUTE, _US_PER_DAY)
+            d = date.fromordinal(days + _EPOCH_DAYS + 1)
+            hour, us = divmod(us, _US_PER_HOUR)
+            minute, us = divmod(us, _US_PER_MINUTE)
+            second, us = divmod(us, _US_PER_SECOND)
+            fields = (d.year, d.month, d.day, hour, minute, second, us, minutes * 60, _TIME)
+        return FhirDateTime._from_fields(fields, None)
@@ -0,0 +1,121 @@
+"""Opt-in, size-bounded LRU cache for parsed FHIR date/dateTime strings."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
+
+from ._parser import ParseError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+T = TypeVar("T")
+A = TypeVar("A")
+
+
+class CacheInfo(NamedTuple):
+    """Snapshot of a :class:`ParseCache`'s counters, like ``functools.lru_cache``'s."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class ParseCache:
+    """Least-recently-used cache of parsed values, keyed by the input string.
+
+    FHIR Bundles repeat the same handful of strings (``meta.lastUpdated``,
+    a batch of vitals' ``effectiveDateTime``, ``birthDate``) over and over,
+    so returning the already-parsed instance skips parsing entirely.
+
+    Disabled (``maxsize == 0``) until :meth:`configure` is called. Once
+    enabled, ``fromisoformat()`` returns the *same* instance for the same
+    input string. That's only safe because a :class:`FhirDate` or
+    :class:`FhirDateTime` *value* never changes once constructed: there is
+    no public way to change a field in place (``replace()``, ``+``, ``-``
+    and friends all return new instances).
+
+    Instances aren't strictly frozen, though. Some private state is filled
+    in on first use, on whichever instance is at hand, shared or not: the
+    hash, the implied interval (``_bounds``) and the UTC offset
+    (``_utcoffset``) are memoised, and a :meth:`FhirDate.lazy` instance
+    parses its source in place. Every one of those writes is derived only
+    from the value's fields (or source), so it's idempotent: threads racing
+    to fill it in write the same thing, and the instance compares, hashes
+    and formats the same before and after. Anything memoised on an
+    instance in future must keep to that rule. Code that reaches into the
+    private ``_year``/``_month``/... attributes voids the guarantee.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        """Create a cache holding up to `maxsize` entries (0 disables it)."""
+        self._data: OrderedDict[Hashable, object] = OrderedDict()
+        self._lock = Lock()
+        self.maxsize = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.configure(maxsize)
+
+    def configure(self, maxsize: int) -> None:
+        """Set the capacity, evicting least-recently-used entries to fit.
+
+        :param maxsize: Maximum number of cached values; ``0`` disables the
+            cache (and empties it).
+        """
+        if maxsize < 0:
+            msg = "maxsize must be >= 0"
+            raise ValueError(msg, maxsize)
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_parse(self, key: Hashable, parse: Callable[[A], T], arg: A) -> T:
+        """Return the cached value for `key`, calling `parse(arg)` on a miss.
+
+        Exceptions from `parse` propagate and nothing is cached, so
+        malformed input keeps raising on every call. Likewise, a
+        :class:`ParseError` returned by `parse` is passed through uncached.
+        """
+        data = self._data
+        with self._lock:
+            value = data.get(key)
+            if value is not None:
+                data.move_to_end(key)
+                self.hits += 1
+                return value  # ty: ignore[invalid-return-type]
+            self.misses += 1
+        # Parse outside the lock: it's the expensive part, and two threads
+        # racing on the same key just produce equal values.
+        value = parse(arg)
+        if isinstance(value, ParseError):
+            return value
+        with self._lock:
+            data[key] = value
+            if len(data) > self.maxsize:
+                data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def info(self) -> CacheInfo:
+        """Return the current hit/miss/eviction counters and size."""
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        """Drop every cached value and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# The single cache consulted by `FhirDate`/`FhirDateTime` parsing.
+parse_cache = ParseCache()
@@ -32,6 +32,7 @@ __all__ = [
     "_cmp",
     "_days_in_month",
     "_format_offset",
+    "_fixed_offset",
     "_format_time",
     "_ymd2ord",
 ]
@@ -242,6 +243,29 @@ def _format_offset(off):
     return s
 
 
+# Parsed fixed-offset timezones, interned so every value parsed from the same
+# "-05:00" feed shares one tzinfo object (and so comparisons between them
+# can take the cheap `mytz is ottz` path rather than calling utcoffset()).
+# Indexed by offset in minutes, shifted to start at 0; filled in lazily.
+# Only whole-minute offsets are interned, which bounds the table at 2879
+# entries no matter what input it's fed.
+_MINUTES_PER_DAY = 24 * 60
+_FIXED_OFFSETS = [None] * (2 * _MINUTES_PER_DAY - 1)
+_FIXED_OFFSETS[_MINUTES_PER_DAY - 1] = timezone.utc
+
+
+def _fixed_offset(seconds, microseconds=0):
+    """Return the shared timezone for a UTC offset strictly within a day."""
+    minutes, rem = divmod(seconds, 60)
+    if rem or microseconds:
+        return timezone(timedelta(seconds=seconds, microseconds=microseconds))
+    idx = minutes + _MINUTES_PER_DAY - 1
+    tz = _FIXED_OFFSETS[idx]
+    if tz is None:
+        tz = _FIXED_OFFSETS[idx] = timezone(timedelta(minutes=minutes))
+    return tz
+
+
 # Correctly substitute for %z and %Z escapes in strftime formats.
 def _wrap_strftime(object, format, timetuple):
     # Don't call utcoffset() or tzname() unless actually needed.
@@ -400,15 +424,11 @@ def _parse_isoformat_time(tstr):
         else:
             tzsign = -1 if tstr[tz_pos - 1] == "-" else 1
 
-            td = timedelta(
-                hours=tz_comps[0],
-                minutes=tz_comps[1],
-                seconds=tz_comps[2],
-                microseconds=tz_comps[3],
+            tzi = _fixed_offset(
+                tzsign * (tz_comps[0] * 3600 + tz_comps[1] * 60 + tz_comps[2]),
+                tzsign * tz_comps[3],
             )
 
-            tzi = timezone(tzsign * td)
-
     time_comps.append(tzi)
 
     return time_comps
@@ -0,0 +1,119 @@
+"""Containers that hash FHIR date/dateTime values on their exact value.
+
+:class:`FhirDate`/:class:`FhirDateTime` hash on the year alone, because
+``==`` treats partial-precision values as equal to anything they contain
+(``FhirDate(2021) == FhirDate(2021, 3)``), and ``hash`` must agree with
+``==``. That's correct, but it puts a year's worth of values in a single
+hash bucket. These containers key on :meth:`FhirDate.exact_key` instead,
+so they deduplicate and look up by exact value in O(1).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping, MutableSet
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from . import FhirDate
+
+T = TypeVar("T", bound="FhirDate")
+V = TypeVar("V")
+
+
+def _exact_key(value: object) -> int | None:
+    # `value.exact_key()`, or None for anything that doesn't have one (so
+    # it can't be a member, just as with a plain set/dict).
+    try:
+        return value.exact_key()  # ty: ignore[unresolved-attribute]
+    except AttributeError:
+        return None
+
+
+class FhirExactSet(MutableSet[T], Generic[T]):
+    """A set of :class:`FhirDate`/:class:`FhirDateTime` values, unique by exact value.
+
+    ``FhirDate(2021)`` and ``FhirDate(2021, 3)`` are different members,
+    even though they compare ``==``. When an equal value is added twice,
+    the first one added is kept.
+    """
+
+    def __init__(self, values: Iterable[T] = ()) -> None:
+        """Create a set holding `values`."""
+        self._data: dict[int, T] = {}
+        for value in values:
+            self.add(value)
+
+    def add(self, value: T) -> None:
+        """Add `value` unless an exactly equal value is already present."""
+        self._data.setdefault(value.exact_key(), value)
+
+    def discard(self, value: T) -> None:
+        """Remove the member exactly equal to `value`, if there is one."""
+        self._data.pop(value.exact_key(), None)
+
+    def __contains__(self, value: object) -> bool:
+        key = _exact_key(value)
+        return key is not None and key in self._data
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._data.values())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._data.values())!r})"
+
+
+class FhirExactDict(MutableMapping[T, V], Generic[T, V]):
+    """A dict keyed by :class:`FhirDate`/:class:`FhirDateTime` values' exact values.
+
+    ``FhirDate(2021)`` and ``FhirDate(2021, 3)`` are different keys, even
+    though they compare ``==``. Like a ``dict``, setting an existing key
+    keeps the key object first used for it and replaces the value.
+    """
+
+    def __init__(self, items: Mapping[T, V] | Iterable[tuple[T, V]] = ()) -> None:
+        """Create a dict holding `items`, a mapping or ``(key, value)`` pairs."""
+        self._data: dict[int, tuple[T, V]] = {}
+        self.update(items)
+
+    def __getitem__(self, key: T) -> V:
+        exact = _exact_key(key)
+        if exact is None or exact not in self._data:
+            raise KeyError(key)
+        return self._data[exact][1]
+
+    def __setitem__(self, key: T, value: V) -> None:
+        exact = key.exact_key()
+        existing = self._data.get(exact)
+        self._data[exact] = (key if existing is None else existing[0], value)
+
+    def __delitem__(self, key: T) -> None:
+        exact = _exact_key(key)
+        if exact is None or exact not in self._data:
+            raise KeyError(key)
+        del self._data[exact]
+
+    def __contains__(self, key: object) -> bool:
+        exact = _exact_key(key)
+        return exact is not None and exact in self._data
+
+    def __iter__(self) -> Iterator[T]:
+        return (key for key, _ in self._data.values())
+
+    def __eq__(self, other: object) -> bool:
+        # Mapping.__eq__ would compare via dict(), hashing keys on year alone.
+        if not isinstance(other, FhirExactDict):
+            return NotImplemented
+        return {k: v for k, (_, v) in self._data.items()} == {k: v for k, (_, v) in other._data.items()}
+
+    __hash__ = None  # Mutable, like dict
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        # Not via dict(): that would hash the keys on their year alone again.
+        items = ", ".join(f"{key!r}: {value!r}" for key, value in self._data.values())
+        return f"{type(self).__name__}({{{items}}})"
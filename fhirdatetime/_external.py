@@ -0,0 +1,187 @@
+"""Sorting NDJSON exports too large to fit in memory, by a date path."""
+
+from __future__ import annotations
+
+import heapq
+import json
+from operator import itemgetter
+from tempfile import TemporaryFile
+from typing import IO, TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Iterator
+    from os import PathLike
+
+    from . import MissingPosition, SortBy
+
+# A record in a run: its sort key and its line, ending in "\n".
+_Record = tuple[int, bytes]
+_key = itemgetter(0)
+
+
+class SortProgress(NamedTuple):
+    """Snapshot of an :class:`ExternalSorter`'s counters."""
+
+    records_read: int
+    runs_written: int
+    bytes_spilled: int
+    records_written: int
+
+
+class ExternalSorter:
+    """Sorts NDJSON records by a date path, holding only a bounded number in memory.
+
+    Records are read into runs of at most `run_size` records or
+    `max_run_bytes` bytes of input, whichever comes first. Each run is
+    sorted on the integer key of :meth:`FhirDateTime.sort_key` (computed
+    once per record, then stored alongside it) and spilled to a temporary
+    file, and the runs are then merged with :func:`heapq.merge`. When there
+    are more than `fan_in` runs, they're first merged `fan_in` at a time
+    into longer runs, so no more than `fan_in` files are ever open at once.
+    Input that fits in a single run is sorted in memory, without spilling.
+
+    The result is exactly ``sort_values(records, key_path, ...)``: a stable
+    sort, records with equal keys keeping their order from the input.
+
+    >>> sorter = ExternalSorter("effectiveDateTime", run_size=1_000_000)
+    >>> with open("export.ndjson", "rb") as src, open("sorted.ndjson", "wb") as dst:
+    ...     dst.writelines(sorter.sort(src))
+
+    The counters (:attr:`records_read`, :attr:`runs_written`,
+    :attr:`bytes_spilled`, :attr:`records_written`) are updated as the sort
+    goes, for reporting progress from another thread, or between the lines
+    :meth:`sort` yields. :meth:`progress` takes a consistent snapshot.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        key_path: str,
+        *,
+        run_size: int = 100_000,
+        max_run_bytes: int = 64 << 20,
+        fan_in: int = 64,
+        missing: MissingPosition = "first",
+        by: SortBy = "fields",
+        reverse: bool = False,
+        tmp_dir: str | PathLike[str] | None = None,
+    ) -> None:
+        """Create a sorter for records by `key_path`, as for :meth:`FhirDateTime.sort_key`.
+
+        :param key_path: The path to each record's date, such as
+            ``"effectiveDateTime"`` or ``"period.start"``.
+        :param run_size: The most records to hold in memory at once.
+        :param max_run_bytes: The most bytes of input lines to hold in
+            memory at once.
+        :param fan_in: The most runs to merge, and so temporary files to
+            have open, at once.
+        :param missing: Where to sort records without a date at `key_path`.
+        :param by: Whether to order by the dates' local ``"fields"`` or their
+            UTC ``"instant"``.
+        :param reverse: Whether to sort latest first.
+        :param tmp_dir: Where to spill runs; the system default if None.
+        """
+        from . import FhirDateTime  # noqa: PLC0415 (circular import)
+
+        if run_size < 1 or max_run_bytes < 1:
+            msg = "run_size and max_run_bytes must be >= 1"
+            raise ValueError(msg, run_size, max_run_bytes)
+        if fan_in < 2:  # noqa: PLR2004
+            msg = "fan_in must be >= 2"
+            raise ValueError(msg, fan_in)
+        self._sort_key = FhirDateTime.sort_key(key_path, missing=missing, by=by)
+        self.run_size = run_size
+        self.max_run_bytes = max_run_bytes
+        self.fan_in = fan_in
+        self.reverse = reverse
+        self.tmp_dir = tmp_dir
+        self.records_read = 0
+        self.runs_written = 0
+        self.bytes_spilled = 0
+        self.records_written = 0
+
+    def sort(self, lines: Iterable[bytes | str]) -> Generator[bytes, None, None]:
+        """Yield the NDJSON records in `lines`, sorted, as lines ending in ``b"\\n"``.
+
+        Blank lines are skipped. Temporary files are removed once the last
+        record has been yielded, or the generator is closed. The counters
+        are reset by this call, before the first record is read.
+        """
+        self.records_read = self.runs_written = self.bytes_spilled = self.records_written = 0
+        return self._sort(lines)
+
+    def _sort(self, lines: Iterable[bytes | str]) -> Generator[bytes, None, None]:
+        runs: list[IO[bytes]] = []
+        # The runs being merged into `runs`, during a merge pass.
+        merging: list[IO[bytes]] = []
+        try:
+            run: list[_Record] = []
+            run_bytes = 0
+            for line in lines:
+                record = self._record(line)
+                if record is None:
+                    continue
+                run.append(record)
+                run_bytes += len(record[1])
+                self.records_read += 1
+                if len(run) >= self.run_size or run_bytes >= self.max_run_bytes:
+                    runs.append(self._spill(self._sorted(run)))
+                    run = []
+                    run_bytes = 0
+            if runs and run:
+                runs.append(self._spill(self._sorted(run)))
+                run = []
+            fan_in = self.fan_in
+            while len(runs) > fan_in:
+                # Each merged run joins `runs` as soon as it's written, so
+                # if a merge fails partway, `finally` still closes it.
+                merging = runs
+                runs = []
+                for i in range(0, len(merging), fan_in):
+                    runs.append(self._spill(self._merge(merging[i : i + fan_in])))
+            records = self._merge(runs) if runs else self._sorted(run)
+            for _, line in records:
+                self.records_written += 1
+                yield line
+        finally:
+            for f in merging + runs:
+                f.close()
+
+    def progress(self) -> SortProgress:
+        """Return the current counters."""
+        return SortProgress(self.records_read, self.runs_written, self.bytes_spilled, self.records_written)
+
+    def _record(self, line: bytes | str) -> _Record | None:
+        if isinstance(line, str):
+            line = line.encode()
+        if not line.strip():
+            return None
+        if not line.endswith(b"\n"):
+            line += b"\n"
+        return self._sort_key(json.loads(line)), line
+
+    def _sorted(self, run: list[_Record]) -> list[_Record]:
+        run.sort(key=_key, reverse=self.reverse)
+        return run
+
+    def _spill(self, records: Iterable[_Record]) -> IO[bytes]:
+        # Writes `records` to a new temporary file, each line prefixed with
+        # its key, so merging doesn't parse the JSON again.
+        f = TemporaryFile(dir=self.tmp_dir)  # noqa: SIM115 (closed by `sort()`)
+        for key, line in records:
+            self.bytes_spilled += f.write(b"%d\t%b" % (key, line))
+        f.seek(0)
+        self.runs_written += 1
+        return f
+
+    def _merge(self, runs: list[IO[bytes]]) -> Iterator[_Record]:
+        # The records of `runs`, merged. Each run file is closed as soon as
+        # it's exhausted. Merging is stable: ties come from earlier runs
+        # first, and the runs are in input order.
+        return heapq.merge(*map(_read_run, runs), key=_key, reverse=self.reverse)
+
+
+def _read_run(f: IO[bytes]) -> Iterator[_Record]:
+    with f:
+        for raw in f:
+            key, _, line = raw.partition(b"\t")
+            yield int(key), line
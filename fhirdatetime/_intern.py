@@ -0,0 +1,65 @@
+"""Opt-in weak-value table of shared FHIR date/dateTime instances."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TypeVar
+from weakref import WeakValueDictionary
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+T = TypeVar("T")
+
+
+class InternTable:
+    """Table of canonical instances, so equal values can share one object.
+
+    A large export has only a few thousand distinct ``birthDate`` values,
+    but parsing it creates a fresh object for every one. Interning maps
+    each distinct value to the first instance seen for it, so the rest
+    can be dropped. Entries are held weakly: a value leaves the table once
+    nothing else refers to it, so the table never keeps values alive.
+
+    :meth:`FhirDate.intern` always consults it. Parsing only does once
+    enabled with :meth:`configure`: ``fromisoformat()``, ``try_parse()``
+    and ``parse_many()`` then return the shared instance for a string
+    they've already parsed, without parsing it again. Sharing is safe for
+    the same reason as with :class:`ParseCache`: values never change once
+    constructed, and what instances memoise is derived from their value.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty table, with interning on parse disabled."""
+        self._data: WeakValueDictionary[Hashable, object] = WeakValueDictionary()
+        self.enabled = False
+
+    def configure(self, enabled: bool) -> None:
+        """Turn interning of parsed values on or off.
+
+        Turning it off leaves already-interned instances in the table for
+        :meth:`FhirDate.intern` to keep using.
+        """
+        self.enabled = enabled
+
+    def get(self, key: Hashable) -> object | None:
+        """Return the instance interned under `key`, or None."""
+        return self._data.get(key)
+
+    def intern(self, key: Hashable, value: T) -> T:
+        """Return the instance interned under `key`, interning `value` if there's none.
+
+        Two threads racing on the same key may each get their own
+        instance back, which is harmless: they're equal.
+        """
+        return self._data.setdefault(key, value)  # ty: ignore[invalid-return-type]
+
+    def clear(self) -> None:
+        """Drop every interned instance from the table."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# The single table consulted by `FhirDate.intern()` and, once enabled, parsing.
+intern_table = InternTable()
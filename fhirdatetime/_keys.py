@@ -0,0 +1,210 @@
+"""Integer keys for FHIR date/dateTime values, and the intervals they imply.
+
+The sort keys, :meth:`FhirDate.exact_key`, comparisons, :class:`SortedTimeline`
+and :func:`matches` all work on the integers computed here.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import TYPE_CHECKING, TypeAlias, TypeGuard
+
+from ._datetime import _days_in_month
+from ._parser import Precision
+
+if TYPE_CHECKING:
+    from . import FhirDate
+
+_US_PER_DAY = 86_400_000_000
+_ONE_US = timedelta(microseconds=1)
+# Days from 0001-01-01 to 1970-01-01, where the columns of `FhirDateArray`
+# and `FhirDateTimeArray` count from.
+_EPOCH_DAYS = date(1970, 1, 1).toordinal() - 1
+# 1970-01-01T00:00 in the sort keys' units (see `_date_sort_key`).
+_UNIX_EPOCH = (_EPOCH_DAYS + 1) * _US_PER_DAY
+
+# Precisions, as module globals for the sort keys, which are too hot for
+# the enum's attribute lookups.
+_YEAR = Precision.YEAR
+_MONTH = Precision.MONTH
+_DAY = Precision.DAY
+_TIME = Precision.TIME
+
+# The UTC offset of each fixed-offset `timezone` seen by
+# `_instant_sort_key`, in microseconds. Only whole-minute offsets are cached,
+# bounding this at 2879 entries.
+_offset_micros: dict[tzinfo, int] = {}
+
+# A value's implied interval, as cached by `_bounds`: (lo, hi, offset,
+# tzinfo). [lo, hi) is in local microseconds, counted from 0000-12-31 like
+# the sort keys; offset is the UTC offset in microseconds, or None when
+# there's no time (or no tzinfo).
+Bounds: TypeAlias = tuple[int, int, int | None, tzinfo | None]
+
+
+def _is_fhir(value: date) -> TypeGuard[FhirDate]:
+    # isinstance(value, FhirDate), for this module, which can't import
+    # FhirDate: only FhirDate/FhirDateTime have a `_bounds` cache.
+    return hasattr(value, "_bounds")
+
+
+def _bounds(value: date) -> Bounds:
+    """Return `value`'s implied interval and UTC offset (see `Bounds`).
+
+    Computed once per :class:`FhirDate`/:class:`FhirDateTime` instance
+    and cached for comparisons, just like `_hashcode`, since both are
+    immutable once constructed. A partial-precision value spans its whole
+    year, month or day; a time-bearing one is the single microsecond it
+    names. The interval starts where the value's sort key does.
+    """
+    if not _is_fhir(value):
+        return _stdlib_bounds(value)
+    bounds = value._bounds
+    if bounds is None:
+        lo = _sort_key(value) >> 2
+        if value._hour is None:
+            bounds = (lo, _latest_micros(value)[0] + 1, None, None)
+        else:
+            bounds = (lo, lo + 1, _offset_micros_of(value), value._tzinfo)  # ty: ignore[unresolved-attribute]
+        value._bounds = bounds
+    return bounds
+
+
+def _stdlib_bounds(value: date) -> Bounds:
+    # `_bounds` for a stdlib date (a day) or datetime (a microsecond), which
+    # has nowhere to cache it.
+    lo = value.toordinal() * _US_PER_DAY
+    if not isinstance(value, datetime):
+        return lo, lo + _US_PER_DAY, None, None
+    lo += ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond
+    offset = value.utcoffset()
+    return lo, lo + 1, None if offset is None else offset // _ONE_US, value.tzinfo
+
+
+def _date_sort_key(value: FhirDate) -> int:
+    # `FhirDate.sort_key()`: where the value's date starts, in microseconds
+    # counted from 0000-12-31 (`date.toordinal()` days), with its precision
+    # in the low 2 bits so coarser values sort first among those starting
+    # together. That orders dates just like their (year, month, day) would,
+    # with missing fields first. Built straight from the fields: keying
+    # shouldn't cost a `_bounds` tuple on every value sorted.
+    year = value._year  # Parses a lazy instance
+    month = value._month
+    day = value._day
+    micros = date(year, month or 1, day or 1).toordinal() * _US_PER_DAY
+    if month is None:
+        return micros << 2 | _YEAR
+    return micros << 2 | (_MONTH if day is None else _DAY)
+
+
+def _sort_key(value: FhirDate) -> int:
+    # `FhirDateTime.sort_key()`: `_date_sort_key`, down to the microsecond
+    # for a value with a time. Local fields, so the UTC offset is ignored.
+    hour = value._hour  # Parses a lazy instance
+    if hour is None:
+        return _date_sort_key(value)
+    t = (hour * 60 + value._minute) * 60 + value._second  # ty: ignore[unresolved-attribute]
+    micros = date(value._year, value._month, value._day).toordinal() * _US_PER_DAY  # ty: ignore[invalid-argument-type]
+    return (micros + t * 1_000_000 + value._microsecond) << 2 | _TIME  # ty: ignore[unresolved-attribute]
+
+
+def _offset_micros_of(value: FhirDate) -> int | None:
+    # `value.utcoffset()` in microseconds. For the sort keys and `_bounds`,
+    # so it's cached for fixed-offset `timezone`s: that skips the call
+    # (and the timedelta it caches on the value), and every cached
+    # `_bounds` with that offset shares the one int.
+    tz = value._tzinfo  # ty: ignore[unresolved-attribute]
+    offset = _offset_micros.get(tz)
+    if offset is None:
+        delta = value.utcoffset()  # ty: ignore[unresolved-attribute]
+        if delta is None:
+            return None
+        offset = delta // _ONE_US
+        if type(tz) is timezone and not offset % 60_000_000:
+            _offset_micros[tz] = offset
+    return offset
+
+
+def _instant_sort_key(value: FhirDate) -> int:
+    # `FhirDateTime.sort_key(by="instant")`: `_sort_key`, shifted to UTC
+    # for a value with a time; a value without one has no offset, so it
+    # stays local (like `exact_key()`). The 0000-12-31 epoch keeps an early
+    # value with a positive UTC offset non-negative.
+    key = _sort_key(value)
+    if value._hour is None:
+        return key
+    return key - ((_offset_micros_of(value) or 0) << 2)
+
+
+def _latest_micros(value: FhirDate) -> tuple[int, Precision]:
+    # The last microsecond of the value's local interval, counted from
+    # 0000-12-31 like `_instant_sort_key`, and the value's precision.
+    year = value._year  # Parses a lazy instance
+    month = value._month
+    day = value._day
+    if month is None:
+        return date(year, 12, 31).toordinal() * _US_PER_DAY + _US_PER_DAY - 1, _YEAR
+    if day is None:
+        return date(year, month, _days_in_month(year, month)).toordinal() * _US_PER_DAY + _US_PER_DAY - 1, _MONTH
+    micros = date(year, month, day).toordinal() * _US_PER_DAY
+    hour = value._hour
+    if hour is None:
+        return micros + _US_PER_DAY - 1, _DAY
+    t = (hour * 60 + value._minute) * 60 + value._second  # ty: ignore[unresolved-attribute]
+    return micros + t * 1_000_000 + value._microsecond, _TIME  # ty: ignore[unresolved-attribute]
+
+
+def _latest_sort_key(value: FhirDate) -> int:
+    # The `assume="latest"` counterpart of `_sort_key`: the last microsecond
+    # of the value's local interval, with the precision inverted in the low
+    # 2 bits so coarser values sort last among those ending together.
+    micros, precision = _latest_micros(value)
+    return micros << 2 | _TIME - precision
+
+
+def _latest_instant_sort_key(value: FhirDate) -> int:
+    # The `assume="latest"` counterpart of `_instant_sort_key`.
+    micros, precision = _latest_micros(value)
+    if precision == _TIME:
+        micros -= _offset_micros_of(value) or 0
+    return micros << 2 | _TIME - precision
+
+
+def _instant_bounds(value: date) -> tuple[int, int]:
+    # The [lo, hi) interval `value` implies, in microseconds counted like
+    # `_instant_sort_key`: UTC when it has an offset, local otherwise. Works
+    # for FhirDate/FhirDateTime and the stdlib types alike.
+    if _is_fhir(value):
+        lo = _instant_sort_key(value) >> 2
+        if value._hour is not None:
+            return lo, lo + 1
+        return lo, (_latest_instant_sort_key(value) >> 2) + 1
+    lo, hi, offset, _ = _stdlib_bounds(value)
+    if offset is None:
+        return lo, hi
+    return lo - offset, hi - offset
+
+
+def _aligned_bounds(a: date, b: date) -> tuple[int, int, int, int]:
+    # Both values' [lo, hi) intervals, shifted to UTC when both have an
+    # offset and their tzinfos differ; otherwise compared as local times.
+    lo, hi, offset, tz = _bounds(a)
+    olo, ohi, ooffset, otz = _bounds(b)
+    if tz is not otz and offset is not None and ooffset is not None:
+        return lo - offset, hi - offset, olo - ooffset, ohi - ooffset
+    return lo, hi, olo, ohi
+
+
+def _cmp_bounds(a: date, b: date) -> int:
+    """Compare two values' implied intervals: -1, 1, or 0 if they overlap.
+
+    Calendar intervals nest, so overlapping always means one contains the
+    other: that's the ambiguous "equal" of comparing only the fields both
+    sides have.
+    """
+    lo, hi, olo, ohi = _aligned_bounds(a, b)
+    if hi <= olo:
+        return -1
+    if lo >= ohi:
+        return 1
+    return 0
@@ -0,0 +1,403 @@
+"""Single-pass parser for FHIR ``date``/``dateTime`` strings.
+
+Replaces the old regex-then-vendored-``fromisoformat``-then-``strptime``
+cascade with one scan that dispatches on string length and separator
+positions. The scanner never raises for malformed input -- it returns a
+:class:`ParseError` instead -- so callers that expect failures don't pay
+for Python's exception machinery on every bad value.
+
+:func:`parse_fields` is the public face of the scanner and the shared core
+that ``FhirDate``/``FhirDateTime`` construction from strings builds on.
+"""
+
+from __future__ import annotations
+
+from datetime import MAXYEAR, MINYEAR, tzinfo as tzinfo_
+from enum import Enum, IntEnum
+from typing import TypeAlias, overload
+
+from ._datetime import _days_in_month, _fixed_offset
+
+
+class Precision(IntEnum):
+    """How much of a FHIR ``date``/``dateTime`` value is populated.
+
+    Ordered from least to most precise, so precisions compare naturally
+    (``Precision.YEAR < Precision.DAY``).
+    """
+
+    YEAR = 0
+    MONTH = 1
+    DAY = 2
+    TIME = 3
+
+
+# What `parse_fields` returns: (year, month, day, hour, minute, second,
+# microsecond, offset_seconds, precision). Unpopulated month/day/hour/minute
+# are None; second/microsecond default to 0, just like the constructors.
+# offset_seconds is None exactly when there's no time.
+Fields: TypeAlias = tuple[int, int | None, int | None, int | None, int | None, int, int, int | float | None, Precision]
+# ASCII bytes the parsers accept in place of a str, e.g. a date inside an
+# mmap'd NDJSON export.
+Buffer: TypeAlias = bytes | bytearray | memoryview
+_BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+_MAX_MONTH = 12
+_MAX_HOUR = 23
+_MAX_MINUTE = 59
+_LEAP_SECOND = 60
+_MIN_DAYS_IN_MONTH = 28
+_MAX_FRACTION_DIGITS = 9  # FHIR's grammar allows up to nanoseconds
+_US_DIGITS = 6
+
+# String lengths of each supported shape, and the positions of the fixed
+# separators within them.
+_LEN_Y = 4
+_LEN_YM = 7
+_LEN_YMD = 10
+_LEN_YMD_HM_Z = 17  # "YYYY-MM-DDThh:mmZ" -- the shortest time-bearing form
+_POS_TIME_SEP = 10
+_POS_MINUTE_SEP = 13
+_POS_SECOND_SEP = 16
+_POS_FRACTION = 19
+_DATE_TIME_SEPARATORS = frozenset("T ")
+
+# Offset shapes (after the sign) that the vendored parser accepted, and
+# that `_format_offset` can produce: hh:mm, hh:mm:ss, hh:mm:ss.ffffff.
+_LEN_OFF_HM = 5
+_LEN_OFF_HMS = 8
+_LEN_OFF_HMSF = 15
+_SECONDS_PER_DAY = 86_400
+
+
+class ParseError(Enum):
+    """Why a string couldn't be parsed as a FHIR ``date``/``dateTime``."""
+
+    MALFORMED = "malformed"
+    YEAR_RANGE = "year out of range"
+    MONTH_RANGE = "month out of range"
+    DAY_RANGE = "day out of range"
+    HOUR_RANGE = "hour out of range"
+    MINUTE_RANGE = "minute out of range"
+    SECOND_RANGE = "second out of range"
+    TZ_REQUIRED = "time without timezone"
+
+    def __bool__(self) -> bool:
+        # Falsy, so ``if (dt := FhirDateTime.try_parse(s)):`` reads like the
+        # usual ``None`` check while still carrying the reason on failure.
+        return False
+
+    def describe(self, s: str) -> str:
+        """Return the full error message for `s` failing with this error."""
+        if self is ParseError.MALFORMED:
+            return f"Invalid isoformat string: {s!r}"
+        if self is ParseError.TZ_REQUIRED:
+            return "FHIR dateTime requires a timezone whenever a time is specified"
+        if self is ParseError.DAY_RANGE:
+            # Only ever returned once year and month have already parsed.
+            return f"day must be in 1..{_days_in_month(int(s[:4]), int(s[5:7]))}"
+        return _RANGE_MESSAGES[self]
+
+
+_RANGE_MESSAGES = {
+    ParseError.YEAR_RANGE: f"year must be in {MINYEAR}..{MAXYEAR}",
+    ParseError.MONTH_RANGE: f"month must be in 1..{_MAX_MONTH}",
+    ParseError.HOUR_RANGE: f"hour must be in 0..{_MAX_HOUR}",
+    ParseError.MINUTE_RANGE: f"minute must be in 0..{_MAX_MINUTE}",
+    ParseError.SECOND_RANGE: f"second must be in 0..{_MAX_MINUTE}",
+}
+_MALFORMED = ParseError.MALFORMED
+_YEAR = Precision.YEAR
+_MONTH = Precision.MONTH
+_DAY = Precision.DAY
+_TIME = Precision.TIME
+
+
+def _scan_offset(s: str, pos: int) -> int | float | ParseError:
+    # `s[pos]` is the sign. Everything after it must be one of the three
+    # offset shapes; hh:mm is by far the most common, so it's checked first.
+    off = s[pos + 1 :]
+    n = len(off)
+    if n not in {_LEN_OFF_HM, _LEN_OFF_HMS, _LEN_OFF_HMSF} or off[2] != ":":
+        return _MALFORMED
+    hh = off[:2]
+    mm = off[3:5]
+    if not (hh.isdigit() and mm.isdigit()):
+        return _MALFORMED
+    seconds = int(hh) * 3600 + int(mm) * 60
+    us = 0
+    if n > _LEN_OFF_HM:
+        ss = off[6:8]
+        if off[5] != ":" or not ss.isdigit():
+            return _MALFORMED
+        seconds += int(ss)
+        if n == _LEN_OFF_HMSF:
+            ff = off[9:]
+            if off[8] != "." or not ff.isdigit():
+                return _MALFORMED
+            us = int(ff)
+    if seconds >= _SECONDS_PER_DAY:
+        # timezone() requires a strictly sub-day offset.
+        return _MALFORMED
+    # A sub-second offset is never valid FHIR, but `_format_offset` can
+    # produce one; it's the only case that isn't a whole number of seconds.
+    offset = seconds + us / 1_000_000 if us else seconds
+    return -offset if s[pos] == "-" else offset
+
+
+def _scan_date(s: str, n: int) -> Fields | ParseError:  # noqa: PLR0911
+    # Year, year-month, and full-date shapes only. `n` is already known to
+    # be too short for a time.
+    if n not in {_LEN_Y, _LEN_YM, _LEN_YMD} or not s.isascii():
+        return _MALFORMED
+    part = s[:4]
+    if not part.isdigit():
+        return _MALFORMED
+    year = int(part)
+    if year < MINYEAR:
+        return ParseError.YEAR_RANGE
+    if n == _LEN_Y:
+        return year, None, None, None, None, 0, 0, None, _YEAR
+
+    part = s[5:7]
+    if s[4] != "-" or not part.isdigit():
+        return _MALFORMED
+    month = int(part)
+    if not 1 <= month <= _MAX_MONTH:
+        return ParseError.MONTH_RANGE
+    if n == _LEN_YM:
+        return year, month, None, None, None, 0, 0, None, _MONTH
+
+    part = s[8:10]
+    if s[7] != "-" or not part.isdigit():
+        return _MALFORMED
+    day = int(part)
+    if not 1 <= day <= _days_in_month(year, month):
+        return ParseError.DAY_RANGE
+    return year, month, day, None, None, 0, 0, None, _DAY
+
+
+def _scan(s: str) -> Fields | ParseError:  # noqa: C901, PLR0911, PLR0912
+    """Parse `s` into `Fields`, or return why it couldn't be.
+
+    Never raises for malformed input. Validation matches
+    `_check_date_fields`/`_check_time_fields` (plus FHIR's leap second,
+    normalized to :59), so callers can build instances from the result
+    without re-checking it.
+    """
+    n = len(s)
+    if n < _LEN_YMD_HM_Z:
+        return _scan_date(s, n)
+
+    # Full dateTime, by far the most common shape: validate every digit of
+    # the date and hh:mm in one isdigit() call rather than one per field.
+    yyyy = s[:4]
+    mo = s[5:7]
+    dd = s[8:10]
+    hh = s[11:13]
+    mi = s[14:16]
+    if not (
+        (yyyy + mo + dd + hh + mi).isdigit()
+        and s.isascii()
+        and s[4] == s[7] == "-"
+        and s[_POS_MINUTE_SEP] == ":"
+        and s[_POS_TIME_SEP] in _DATE_TIME_SEPARATORS
+    ):
+        return _MALFORMED
+    year = int(yyyy)
+    if year < MINYEAR:
+        return ParseError.YEAR_RANGE
+    month = int(mo)
+    if not 1 <= month <= _MAX_MONTH:
+        return ParseError.MONTH_RANGE
+    day = int(dd)
+    # Every month has at least 28 days; only look up the real limit past that.
+    if day < 1 or (day > _MIN_DAYS_IN_MONTH and day > _days_in_month(year, month)):
+        return ParseError.DAY_RANGE
+    hour = int(hh)
+    if hour > _MAX_HOUR:
+        return ParseError.HOUR_RANGE
+    minute = int(mi)
+    if minute > _MAX_MINUTE:
+        return ParseError.MINUTE_RANGE
+
+    # Locate the timezone designator first, so seconds and fractional
+    # seconds can be sliced out in one go rather than scanned digit by digit.
+    last = s[-1]
+    if last == "Z":
+        tz_pos = n - 1
+    elif "+" in s:
+        tz_pos = s.find("+", _POS_SECOND_SEP)
+    else:
+        tz_pos = s.find("-", _POS_SECOND_SEP)
+    if tz_pos < 0:
+        # Either no offset at all, or garbage where one should be.
+        return ParseError.TZ_REQUIRED if last.isdigit() else _MALFORMED
+
+    second = 0
+    microsecond = 0
+    if tz_pos != _POS_SECOND_SEP:
+        ss = s[17:19]
+        if s[_POS_SECOND_SEP] != ":" or tz_pos < _POS_FRACTION or not ss.isdigit():
+            return _MALFORMED
+        second = int(ss)
+        if second == _LEAP_SECOND:
+            # FHIR's dateTime grammar explicitly allows a leap second, but
+            # this library never produces one -- per FHIR's own guidance
+            # ("applications reading times SHOULD accept and handle leap
+            # seconds gracefully, and applications producing them MAY
+            # choose to avoid encoding leap seconds"), normalize it to :59
+            # rather than rejecting or attempting to store it distinctly.
+            second = _MAX_MINUTE
+        elif second > _MAX_MINUTE:
+            return ParseError.SECOND_RANGE
+        if tz_pos != _POS_FRACTION:
+            frac = s[20:tz_pos]
+            if s[_POS_FRACTION] != "." or not frac.isdigit() or len(frac) > _MAX_FRACTION_DIGITS:
+                return _MALFORMED
+            # Pad/truncate to exactly microseconds: FHIR allows anywhere
+            # from 1 to 9 fractional digits.
+            microsecond = int(frac[:_US_DIGITS].ljust(_US_DIGITS, "0"))
+
+    if tz_pos == n - 1:
+        if last != "Z":
+            return _MALFORMED
+        offset = 0
+    else:
+        offset = _scan_offset(s, tz_pos)
+        if isinstance(offset, ParseError):
+            return offset
+
+    return year, month, day, hour, minute, second, microsecond, offset, _TIME
+
+
+def parse_fields(s: str | Buffer, start: int = 0, end: int | None = None) -> Fields:
+    """Parse a FHIR ``date``/``dateTime`` string into a plain tuple of numbers.
+
+    Validates exactly like the :class:`FhirDate`/:class:`FhirDateTime`
+    constructors do, but builds no objects beyond the returned tuple --
+    useful for pipelines that only need the numbers (bucketing by year and
+    month, writing to a columnar store, ...):
+
+    >>> parse_fields("2021-03-15T20:54:00.5-05:00")
+    (2021, 3, 15, 20, 54, 0, 500000, -18000, <Precision.TIME: 3>)
+    >>> parse_fields("2021-03")
+    (2021, 3, None, None, None, 0, 0, None, <Precision.MONTH: 1>)
+
+    :param s: A FHIR ``date`` or ``dateTime`` string, or the same as ASCII
+        ``bytes``/``bytearray``/``memoryview``.
+    :param start: Index in `s` where the value starts.
+    :param end: Index in `s` just past the value's end; defaults to the end
+        of `s`. With `start`, lets a scanner parse a date straight out of a
+        large buffer without slicing it first.
+    :return: ``(year, month, day, hour, minute, second, microsecond,
+        offset_seconds, precision)``. Unpopulated ``month``/``day``/
+        ``hour``/``minute`` are ``None``, while ``second``/``microsecond``
+        default to ``0``, just like the constructors. ``offset_seconds`` is
+        the UTC offset in seconds east of UTC (``0`` for ``Z``), or
+        ``None`` when there's no time. It's an ``int`` for every offset
+        FHIR allows; only the non-FHIR ``hh:mm:ss.ffffff`` form produces a
+        ``float``.
+    :raises ValueError: If `s` isn't a valid FHIR ``date``/``dateTime``.
+    """
+    if start or end is not None:
+        s = _as_str(s, start, end)
+    return _parse(s)
+
+
+def _offset_tzinfo(offset: float | None) -> tzinfo_ | None:
+    # The tzinfo for a parsed `offset_seconds`, shared with every other
+    # value parsed with the same offset.
+    if offset is None:
+        return None
+    return _fixed_offset(offset)
+
+
+# Lengths of the time-bearing strings `FhirDateTime.isoformat()` produces:
+# "YYYY-MM-DDThh:mm:ss+hh:mm", optionally with ".ffffff" before the offset.
+_LEN_CANONICAL = 25
+_LEN_CANONICAL_US = 32
+_POS_CANONICAL_US_OFFSET = 26
+
+
+def _is_canonical(s: str) -> bool:
+    """Whether ``FhirDateTime.isoformat()`` would reproduce `s` exactly.
+
+    Only looks at shape, assuming `s` parses: every date-only string is
+    canonical, while time-bearing ones must have seconds (but not a leap
+    second), six fractional digits or none (and then not all zeros), and a
+    ``+hh:mm``/``-hh:mm`` offset that isn't ``-00:00``.
+    """
+    n = len(s)
+    if n <= _LEN_YMD:
+        return True
+    if n == _LEN_CANONICAL:
+        off = _POS_FRACTION
+    elif (
+        n == _LEN_CANONICAL_US
+        and s[_POS_FRACTION] == "."
+        and s[_POS_FRACTION + 1 : _POS_CANONICAL_US_OFFSET] != "000000"
+    ):
+        off = _POS_CANONICAL_US_OFFSET
+    else:
+        return False
+    return (
+        s[_POS_TIME_SEP] == "T"
+        and s[_POS_SECOND_SEP] == ":"
+        and s[_POS_SECOND_SEP + 1 : _POS_FRACTION] != "60"
+        and s[off] in "+-"
+        and s[off:] != "-00:00"
+    )
+
+
+@overload
+def _as_str(s: str | Buffer, start: int = 0, end: int | None = None) -> str: ...
+
+
+@overload
+def _as_str(s: object, start: int = 0, end: int | None = None) -> object: ...
+def _as_str(s: object, start: int = 0, end: int | None = None) -> object:
+    # `s[start:end]` as a str when `s` is a str or an ASCII buffer; anything
+    # else is returned as-is for the caller to reject. Slicing a memoryview
+    # doesn't copy, so decoding the slice is the only copy made of a buffer.
+    # Non-ASCII bytes decode to U+FFFD, which the scanner rejects as
+    # malformed like any other unexpected character.
+    if isinstance(s, str):
+        return s[start:end]
+    if isinstance(s, _BUFFER_TYPES):
+        if start or end is not None:
+            s = memoryview(s)[start:end]
+        return str(s, "ascii", "replace")
+    return s
+
+
+def _try_parse(s: object, *, date_only: bool = False) -> Fields | ParseError:
+    # `_scan` for arbitrary input: buffers are decoded, and anything else
+    # that isn't a str is malformed. With `date_only`, anything longer than
+    # a full date is malformed too.
+    if not isinstance(s, str):
+        s = _as_str(s)
+        if not isinstance(s, str):
+            return _MALFORMED
+    if date_only and len(s) > _LEN_YMD:
+        return _MALFORMED
+    return _scan(s)
+
+
+def _parse(s: str | Buffer, *, date_only: bool = False) -> Fields:
+    """Like `_try_parse`, but raise `ValueError` for malformed input.
+
+    With `date_only`, a malformed string raises the same "Unknown date
+    format." message `FhirDate.fromisoformat` has always raised.
+    """
+    if not isinstance(s, str):
+        if not isinstance(s, _BUFFER_TYPES):
+            msg = f"fromisoformat: argument must be str or ASCII bytes, not {type(s).__name__}"
+            raise TypeError(msg)
+        s = str(s, "ascii", "replace")
+    fields = _try_parse(s, date_only=date_only)
+    if isinstance(fields, ParseError):
+        msg = "Unknown date format." if date_only and fields is _MALFORMED else fields.describe(s)
+        # ParseError describes a bad value, not a bad type.
+        raise ValueError(msg)  # noqa: TRY004
+    return fields
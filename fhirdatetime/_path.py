@@ -0,0 +1,73 @@
+"""Attribute paths into FHIR resources, as taken by ``sort_key(attr_path)``.
+
+A path is dot-separated names, each optionally followed by list indexes:
+``"effectivePeriod.start"``, ``"identifier[0].period.end"``. Names are
+looked up as mapping keys on a mapping (such as a resource parsed from
+JSON) and as attributes on anything else (such as a ``fhir.resources``
+model).
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# One dot-separated part of a path: an optional name, then any indexes.
+_PART = re.compile(r"(?P<name>[^.\[\]]*)(?P<indexes>(?:\[-?\d+\])*)")
+_INDEX = re.compile(r"\[(-?\d+)\]")
+
+
+def _steps(path: str) -> tuple[str | int, ...]:
+    # `path` as a flat sequence of names (str) and indexes (int).
+    steps: list[str | int] = []
+    for part in path.split("."):
+        m = _PART.fullmatch(part)
+        if m is None or not (m["name"] or m["indexes"]):
+            msg = f"invalid attribute path {path!r}"
+            raise ValueError(msg)
+        if m["name"]:
+            steps.append(m["name"])
+        steps.extend(int(i) for i in _INDEX.findall(m["indexes"]))
+    return tuple(steps)
+
+
+@lru_cache(maxsize=256)
+def _compile_path(path: str) -> Callable[[object], object]:
+    """Return a function that follows `path` from the object it's given.
+
+    `path` is only parsed once: compiled paths are cached by string. The
+    function returns ``None`` when the path leads nowhere: a ``None``
+    along the way, a missing mapping key, an index past the end of a list,
+    or a step that doesn't fit the data's shape, such as an index into a
+    mapping or a name on a list (a repeating element in the JSON where a
+    single one was expected, or vice versa). A missing attribute still
+    raises :class:`AttributeError`, since that's almost certainly a
+    misspelled path.
+
+    :raises ValueError: If `path` is malformed, e.g. ``"a..b"``.
+    """
+    steps = _steps(path)
+
+    def extract(obj: object) -> object:
+        for step in steps:
+            if obj is None:
+                return None
+            if type(step) is int:
+                try:
+                    obj = obj[step]  # ty: ignore[not-subscriptable]
+                except (IndexError, KeyError, TypeError):
+                    return None
+            elif isinstance(obj, Mapping):
+                obj = obj.get(step)
+            elif isinstance(obj, list):
+                return None
+            else:
+                obj = getattr(obj, step)  # ty: ignore[invalid-argument-type]
+        return obj
+
+    return extract
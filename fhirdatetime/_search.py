@@ -0,0 +1,78 @@
+"""Evaluating FHIR date search prefixes on the intervals values imply."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING
+
+from ._keys import _aligned_bounds
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from . import SearchPrefix
+
+# Each prefix's test, on the search value's [lo, hi) interval and the
+# target's [tlo, thi), as defined by the FHIR search spec.
+_TESTS: dict[str, Callable[[int, int, int, int], bool]] = {
+    "eq": lambda lo, hi, tlo, thi: lo <= tlo and thi <= hi,
+    "ne": lambda lo, hi, tlo, thi: tlo < lo or thi > hi,
+    "gt": lambda lo, hi, tlo, thi: thi > hi,
+    "lt": lambda lo, hi, tlo, thi: tlo < lo,
+    "ge": lambda lo, hi, tlo, thi: thi > hi or tlo >= lo,
+    "le": lambda lo, hi, tlo, thi: tlo < lo or thi <= hi,
+    "sa": lambda lo, hi, tlo, thi: tlo >= hi,
+    "eb": lambda lo, hi, tlo, thi: thi <= lo,
+    # With the search interval widened by the margin, as computed by `matches()`.
+    "ap": lambda lo, hi, tlo, thi: tlo < hi and thi > lo,
+}
+
+
+def matches(prefix: SearchPrefix, value: str | date, *, now: date | None = None) -> Callable[[date | None], bool]:
+    """Return a predicate testing targets against the FHIR search ``prefix`` + ``value``.
+
+    As in the FHIR search spec, `value` and each target stand for the
+    intervals they imply: ``2021-03`` is ``[2021-03-01T00:00,
+    2021-04-01T00:00)``, while a value with a time is the microsecond it
+    names. Then, for a target:
+
+    - ``eq``: its interval is within `value`'s; ``ne``: it isn't.
+    - ``gt``/``lt``: it extends after/before `value`'s.
+    - ``ge``/``le``: ``gt``/``lt``, or ``eq``.
+    - ``sa``/``eb``: it starts after/ends before `value`'s.
+    - ``ap``: it overlaps `value`'s, widened on both sides by 10% of the
+      time between `value` and `now` (the current time if None).
+
+    Both intervals are computed as integer microseconds, with offsets
+    handled just like the comparison operators handle them, and `value`'s
+    only once, so the predicate is cheap to apply to many targets. A target
+    of None never matches.
+
+    >>> in_march = matches("eq", "2021-03")
+    >>> in_march(FhirDateTime("2021-03-15T10:30:00Z")), in_march(FhirDate(2021))
+    (True, False)
+
+    :param prefix: The search prefix, such as ``"ge"``.
+    :param value: The search value, as a FHIR string or a date/datetime.
+    :param now: The time ``ap`` measures the approximation margin from.
+    :raises ValueError: If `prefix` isn't a FHIR date search prefix.
+    """
+    from . import FhirDateTime  # noqa: PLC0415 (circular import)
+
+    test = _TESTS.get(prefix)
+    if test is None:
+        msg = f"prefix must be one of {', '.join(_TESTS)}, not {prefix!r}"
+        raise ValueError(msg)
+    search = FhirDateTime.fromisoformat(value) if isinstance(value, str) else value
+    margin = 0
+    if prefix == "ap":
+        lo, _, now_lo, _ = _aligned_bounds(search, datetime.now(UTC) if now is None else now)
+        margin = abs(now_lo - lo) // 10
+
+    def match(target: date | None) -> bool:
+        if target is None:
+            return False
+        lo, hi, tlo, thi = _aligned_bounds(search, target)
+        return test(lo - margin, hi + margin, tlo, thi)
+
+    return match
@@ -0,0 +1,290 @@
+"""Sorting whole collections of FHIR date/dateTime values at once.
+
+:func:`sort_values` and :func:`argsort` order a collection exactly as
+``sorted(seq, key=FhirDateTime.sort_key(key_path))`` would. Each item's
+integer key is computed once, then sorted with :func:`sorted`: over
+single ints, its C merge sort beats anything that could be written here in
+Python, radix sorts included.
+
+For a :class:`FhirDateArray`/:class:`FhirDateTimeArray`, the keys come
+straight from the array's columns, without building an object per element.
+:func:`argsort` is then the fast path: sorting the array itself saves
+memory, not time (see :func:`sort_values`).
+
+:func:`nsmallest`, :func:`nlargest`, :func:`earliest` and :func:`latest`
+pick out just the first few items in that order, in a single pass over
+the collection, on the same precomputed keys.
+"""
+
+from __future__ import annotations
+
+import heapq
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, TypeVar, overload
+
+from ._array import _US_PER_MINUTE, FhirDateTimeArray, _FhirArray
+from ._keys import _UNIX_EPOCH, _latest_instant_sort_key, _latest_sort_key
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from . import Assume, MissingPosition, SortBy
+
+A = TypeVar("A", bound=_FhirArray)
+T = TypeVar("T")
+
+_key = itemgetter(0)
+
+
+def _array_keys(arr: _FhirArray, by: SortBy) -> list[int]:
+    # `FhirDateTime.sort_key(by=by)` of each element, from `arr`'s columns:
+    # where its interval starts, then its precision. For "instant" that's
+    # what the columns hold, UTC for values with a time; for "fields", the
+    # local start. The columns count from 1970, the keys from 0000-12-31.
+    if by not in {"fields", "instant"}:
+        msg = f"by must be 'fields' or 'instant', not {by!r}"
+        raise ValueError(msg)
+    micros = arr.micros
+    precisions = arr.precisions
+    if by == "fields" and isinstance(arr, FhirDateTimeArray):
+        no_offset = arr.NO_OFFSET
+        return [
+            (m + _UNIX_EPOCH if o == no_offset else m + _UNIX_EPOCH + o * _US_PER_MINUTE) << 2 | p
+            for m, p, o in zip(micros, precisions, arr.offsets, strict=True)
+        ]
+    return [(m + _UNIX_EPOCH) << 2 | p for m, p in zip(micros, precisions, strict=True)]
+
+
+def _take(arr: A, order: list[int]) -> A:
+    # A new array of `arr`'s elements, in `order`.
+    taken = type(arr)()
+    for name in arr._columns:
+        column = getattr(arr, name)
+        taken_column = column[:0]
+        taken_column.extend(map(column.__getitem__, order))
+        setattr(taken, name, taken_column)
+    return taken
+
+
+def _sorted_dates(arr: A, reverse: bool, by: SortBy) -> A:
+    # A FhirDateArray, sorted. Its key is its whole row (its shifted
+    # `micros << 2 | precision`, whatever `by`), so equal keys are equal
+    # rows: sorting the keys themselves needn't be stable, and the columns
+    # come straight back out of them, without gathering anything through a
+    # permutation.
+    keys = _array_keys(arr, by)
+    keys.sort(reverse=reverse)
+    result = type(arr)()
+    result.micros.extend([(k >> 2) - _UNIX_EPOCH for k in keys])
+    result.precisions.extend([k & 3 for k in keys])
+    return result
+
+
+def _sort_key(key_path: str | None, missing: MissingPosition, by: SortBy) -> Callable[[Any], int]:
+    from . import FhirDateTime  # noqa: PLC0415 (circular import)
+
+    return FhirDateTime.sort_key(key_path, missing=missing, by=by)
+
+
+def _check_no_path(key_path: str | None) -> None:
+    if key_path is not None:
+        msg = "key_path can't be used with an array, whose elements are the values themselves"
+        raise TypeError(msg)
+
+
+@overload
+def sort_values(seq: A, key_path: None = None, reverse: bool = False, *, by: SortBy = "fields") -> A: ...
+@overload
+def sort_values(
+    seq: Iterable[T],
+    key_path: str | None = None,
+    reverse: bool = False,
+    *,
+    missing: MissingPosition = "first",
+    by: SortBy = "fields",
+) -> list[T]: ...
+def sort_values(
+    seq: Iterable[T] | A,
+    key_path: str | None = None,
+    reverse: bool = False,
+    *,
+    missing: MissingPosition = "first",
+    by: SortBy = "fields",
+) -> list[T] | A:
+    """Return `seq`'s items in order, as sorted by :meth:`FhirDateTime.sort_key`.
+
+    Exactly ``sorted(seq, key=FhirDateTime.sort_key(key_path, missing=missing,
+    by=by), reverse=reverse)``: a stable sort, so items with equal keys keep
+    their order, even with `reverse`. `seq` may hold :class:`FhirDate` and
+    :class:`FhirDateTime` values, or, given a `key_path`, items containing
+    them (see :meth:`FhirDateTime.sort_key`).
+
+    Given a :class:`FhirDateArray` or :class:`FhirDateTimeArray`, returns a
+    new, sorted array of the same type instead, sorting on its columns
+    without building its elements. That saves memory, not time: a
+    :class:`FhirDateTimeArray`'s columns are gathered through the
+    permutation an element at a time, which costs about as much as the
+    sort itself, so it's no faster than :func:`sorted` on a list of
+    already-built values. When speed matters, use :func:`argsort`, and
+    apply its permutation only to what needs reordering.
+
+    >>> [v.isoformat() for v in sort_values([FhirDateTime("2021-04"), FhirDateTime("2021")])]
+    ['2021', '2021-04']
+    """
+    if isinstance(seq, _FhirArray):
+        _check_no_path(key_path)
+        if not isinstance(seq, FhirDateTimeArray):
+            return _sorted_dates(seq, reverse, by)  # ty: ignore[invalid-return-type]
+        return _take(seq, argsort(seq, reverse=reverse, by=by))  # ty: ignore[invalid-return-type]
+    return sorted(seq, key=_sort_key(key_path, missing, by), reverse=reverse)
+
+
+def argsort(
+    seq: Iterable[object],
+    key_path: str | None = None,
+    reverse: bool = False,
+    *,
+    missing: MissingPosition = "first",
+    by: SortBy = "fields",
+) -> list[int]:
+    """Return the permutation of indexes that :func:`sort_values` would sort `seq` into.
+
+    That is, ``[seq[i] for i in argsort(seq)]`` is ``sort_values(seq)``, for
+    reordering other columns of a table along with this one. For a
+    :class:`FhirDateArray` or :class:`FhirDateTimeArray`, the keys come from
+    its columns, without building its elements.
+
+    >>> argsort(FhirDateTimeArray.from_strings(["2021-04", "2020", "2021"]))
+    [1, 2, 0]
+    """
+    if isinstance(seq, _FhirArray):
+        _check_no_path(key_path)
+        keys = _array_keys(seq, by)
+    else:
+        keys = list(map(_sort_key(key_path, missing, by), seq))
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+
+def _rank_key(key_path: str | None, by: SortBy, assume: Assume) -> Callable[[Any], int]:
+    # `sort_key(key_path, by=by)`, or its "latest" counterpart, with
+    # missing values keyed -1 (every other key is non-negative).
+    from . import FhirDateTime, _path_key  # noqa: PLC0415 (circular import)
+
+    if assume == "earliest":
+        return FhirDateTime.sort_key(key_path, by=by)
+    if assume != "latest":
+        msg = f"assume must be 'earliest' or 'latest', not {assume!r}"
+        raise ValueError(msg)
+    if by == "fields":
+        key = _latest_sort_key
+    elif by == "instant":
+        key = _latest_instant_sort_key
+    else:
+        msg = f"by must be 'fields' or 'instant', not {by!r}"
+        raise ValueError(msg)
+    if key_path is None:
+        return key
+    return _path_key(key_path, key, FhirDateTime, "first")
+
+
+def _keyed(iterable: Iterable[T], key: Callable[[T], int]) -> Iterator[tuple[int, T]]:
+    # Each item with its key, skipping those without a value.
+    for item in iterable:
+        k = key(item)
+        if k >= 0:
+            yield k, item
+
+
+def nsmallest(
+    n: int,
+    iterable: Iterable[T],
+    key_path: str | None = None,
+    *,
+    assume: Assume = "earliest",
+    by: SortBy = "fields",
+) -> list[T]:
+    """Return the `n` earliest items of `iterable`, earliest first.
+
+    Like :func:`heapq.nsmallest`, this takes a single pass, keeping only
+    the `n` earliest items seen so far, so it's O(len(iterable) * log(n)),
+    and each item's key is computed once. Items whose `key_path` leads to
+    no value are skipped.
+
+    With the default ``assume="earliest"``, that's exactly
+    ``sort_values(iterable, key_path, by=by)[:n]`` once the skipped items
+    are left out, rather than sorted first: a partial value ranks by
+    the start of the interval it implies, so ``FhirDateTime(2021)`` ranks
+    as 2021-01-01, before ``FhirDateTime(2021, 6)``. With
+    ``assume="latest"``, it ranks by the end instead, as
+    2021-12-31T23:59:59.999999, after ``FhirDateTime(2021, 6)``. Either way,
+    the answer doesn't depend on the order of `iterable`, unlike
+    :func:`min`, which compares with the ambiguous ``<``, but ties between
+    values ranked the same keep their order from `iterable`.
+
+    >>> values = [FhirDateTime(2021, 6), FhirDateTime(2021), FhirDateTime(2020, 12, 31)]
+    >>> nsmallest(2, values, assume="latest")
+    [fhirdatetime.FhirDateTime(2020, 12, 31), fhirdatetime.FhirDateTime(2021, 6)]
+
+    :param n: How many items to return, at most.
+    :param key_path: The path to each item's date, as for
+        :meth:`FhirDateTime.sort_key`; None if the items are the dates.
+    :param assume: Whether a partial value ranks by the ``"earliest"`` or the
+        ``"latest"`` instant it could be.
+    :param by: Whether to rank by local ``"fields"`` or the UTC ``"instant"``.
+    """
+    return [item for _, item in heapq.nsmallest(n, _keyed(iterable, _rank_key(key_path, by, assume)), key=_key)]
+
+
+def nlargest(
+    n: int,
+    iterable: Iterable[T],
+    key_path: str | None = None,
+    *,
+    assume: Assume = "earliest",
+    by: SortBy = "fields",
+) -> list[T]:
+    """Return the `n` latest items of `iterable`, latest first.
+
+    The counterpart of :func:`nsmallest`, taking the same arguments and
+    likewise skipping items without a value: with the default
+    ``assume="earliest"``, that's exactly ``sort_values(iterable, key_path,
+    reverse=True, by=by)[:n]`` once those are left out. For the most recent
+    observations,
+    ``assume="latest"`` ranks ``FhirDateTime(2021)`` after
+    ``FhirDateTime(2021, 6)``, as it may be later.
+    """
+    return [item for _, item in heapq.nlargest(n, _keyed(iterable, _rank_key(key_path, by, assume)), key=_key)]
+
+
+def earliest(
+    iterable: Iterable[T],
+    key_path: str | None = None,
+    *,
+    assume: Assume = "earliest",
+    by: SortBy = "fields",
+    default: T | None = None,
+) -> T | None:
+    """Return the earliest item of `iterable`, as ranked by :func:`nsmallest`.
+
+    That's the first of the earliest if several rank the same, or `default`
+    if `iterable` holds no item with a value.
+    """
+    found = min(_keyed(iterable, _rank_key(key_path, by, assume)), key=_key, default=None)
+    return default if found is None else found[1]
+
+
+def latest(
+    iterable: Iterable[T],
+    key_path: str | None = None,
+    *,
+    assume: Assume = "earliest",
+    by: SortBy = "fields",
+    default: T | None = None,
+) -> T | None:
+    """Return the latest item of `iterable`, as ranked by :func:`nlargest`.
+
+    That's the first of the latest if several rank the same, or `default`
+    if `iterable` holds no item with a value.
+    """
+    found = max(_keyed(iterable, _rank_key(key_path, by, assume)), key=_key, default=None)
+    return default if found is None else found[1]
@@ -0,0 +1,137 @@
+"""A container keeping FHIR values (or items containing them) in time order."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, TypeVar, overload
+
+from ._keys import _instant_bounds
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from datetime import date
+
+T = TypeVar("T")
+
+
+class SortedTimeline(Sequence[T]):
+    """A list of items kept sorted by when their FHIR date/dateTime starts.
+
+    Items are ordered as by ``FhirDateTime.sort_key(key_path, by="instant")``:
+    by the UTC instant each value starts at (the local start for a value
+    without a time), less precise values first among those starting
+    together, and otherwise in the order they were added. Each item's key
+    is computed once, when it's added, so range queries are a couple of
+    :mod:`bisect` searches over plain ints rather than a scan comparing
+    values.
+
+    Query bounds may be :class:`FhirDate`, :class:`FhirDateTime` or stdlib
+    dates/datetimes, and each stands for the whole interval it implies: a
+    start bound is taken at its first instant, an end bound at its last, so
+    ``between(FhirDate(2021, 3), FhirDate(2021, 3))`` is everything that
+    starts in March 2021.
+
+    >>> timeline = SortedTimeline(encounters, "period.start")
+    >>> timeline.between(FhirDateTime(2021, 3), FhirDateTime(2021, 4))  # March and April
+    >>> timeline.last_before(FhirDateTime("2021-03-15T10:30:00Z"))  # Most recently started
+
+    Indexing and iterating give the items in order; slicing gives a list.
+    """
+
+    __slots__ = ("_items", "_key", "_keys")
+
+    def __init__(self, items: Iterable[T] = (), key_path: str | None = None) -> None:
+        """Create a timeline holding `items`, keyed by the value at `key_path`.
+
+        :param items: The values, or items containing them.
+        :param key_path: The path to each item's value, as for
+            :meth:`FhirDateTime.sort_key`; None if the items are the values.
+        :raises TypeError: If an item's path leads to no value.
+        """
+        from . import FhirDateTime  # noqa: PLC0415 (circular import)
+
+        self._key: Callable[[Any], int] = FhirDateTime.sort_key(key_path, missing="raise", by="instant")
+        self._keys: list[int] = []
+        self._items: list[T] = []
+        self.update(items)
+
+    def add(self, item: T) -> None:
+        """Insert `item`, after any items starting at the same time.
+
+        Finding its place is a binary search, but making room for it moves
+        every item after it along, so use :meth:`update` to insert many.
+        """
+        key = self._key(item)
+        i = bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._items.insert(i, item)
+
+    def update(self, items: Iterable[T]) -> None:
+        """Insert every one of `items`, faster than adding them one by one."""
+        items = list(items)
+        if not items:
+            return
+        keys = self._keys + list(map(self._key, items))
+        every = self._items + items
+        # The merge sort finds the two sorted runs, so this is O(n) when
+        # `items` are already in order.
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[i] for i in order]
+        self._items = [every[i] for i in order]
+
+    def remove(self, item: T) -> None:
+        """Remove the first occurrence of `item`, found by its key and ``==``.
+
+        :raises ValueError: If `item` isn't in the timeline.
+        """
+        key = self._key(item)
+        keys = self._keys
+        i = bisect_left(keys, key)
+        for j in range(i, bisect_right(keys, key, i)):
+            if self._items[j] == item:
+                del keys[j]
+                del self._items[j]
+                return
+        msg = "SortedTimeline.remove(item): item not in timeline"
+        raise ValueError(msg)
+
+    def between(self, start: date | None = None, end: date | None = None) -> list[T]:
+        """Return the items starting at or after `start` and before `end`, in order.
+
+        That is, in ``[start, end)``, where `start` is taken at its first
+        instant and `end` at its last, so ``between(x, x)`` is every item
+        starting within `x`. An `end` with a time is its own last instant,
+        so an item starting at exactly `end` is included. A bound of None
+        leaves that side open.
+        """
+        keys = self._keys
+        lo = 0 if start is None else bisect_left(keys, _instant_bounds(start)[0] << 2)
+        hi = len(keys) if end is None else bisect_left(keys, _instant_bounds(end)[1] << 2, lo)
+        return self._items[lo:hi]
+
+    def first_after(self, bound: date) -> T | None:
+        """Return the first item starting after all of `bound`, or None."""
+        i = bisect_left(self._keys, _instant_bounds(bound)[1] << 2)
+        return self._items[i] if i < len(self._items) else None
+
+    def last_before(self, bound: date) -> T | None:
+        """Return the last item starting before any of `bound`, or None."""
+        i = bisect_left(self._keys, _instant_bounds(bound)[0] << 2)
+        return self._items[i - 1] if i else None
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._items!r})"
@@ -0,0 +1,96 @@
+"""Tests for the columnar FhirDateArray/FhirDateTimeArray containers."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from fhirdatetime import FhirDate, FhirDateArray, FhirDateTime, FhirDateTimeArray
+from fhirdatetime._array import _FhirArray
+
+_STRINGS = [
+    "2021",
+    "2021-03",
+    "2021-03-15",
+    "2021-03-15T10:30:05-05:00",
+    "2021-03-15T10:30:05.123456+05:30",
+    "1969-12-31T23:59:59Z",
+    "0001-01-01T00:00:00+14:00",
+    "9999-12-31T23:59:59.999999-12:00",
+]
+
+
+def test_datetime_round_trip() -> None:
+    """Every element comes back equal in every field to what went in."""
+    arr = FhirDateTimeArray.from_strings(_STRINGS)
+    assert len(arr) == len(_STRINGS)
+    for value, s in zip(arr, _STRINGS, strict=True):
+        expected = FhirDateTime(s)
+        assert value.exact_key() == expected.exact_key()
+        assert value.utcoffset() == expected.utcoffset()
+    assert FhirDateTimeArray(FhirDateTime(s) for s in _STRINGS) == arr
+
+
+def test_datetime_columns() -> None:
+    """The columns hold epoch microseconds, precision and offset minutes."""
+    arr = FhirDateTimeArray.from_strings(["1970-01-02", "1970-01-01T01:00:00+01:00"])
+    assert list(arr.micros) == [86_400_000_000, 0]
+    assert list(arr.precisions) == [2, 3]
+    assert list(arr.offsets) == [FhirDateTimeArray.NO_OFFSET, 60]
+    assert memoryview(arr.micros).nbytes == 16
+
+
+def test_from_stdlib() -> None:
+    """Stdlib dates and aware datetimes are accepted, keeping only the offset of a tzinfo."""
+    arr = FhirDateTimeArray([date(2021, 3, 15)])
+    arr.append(datetime(2021, 3, 15, 10, 30, tzinfo=ZoneInfo("America/New_York")))
+    assert arr[0] == FhirDateTime(2021, 3, 15)
+    assert arr[1].isoformat() == "2021-03-15T10:30:00-04:00"
+    with pytest.raises(ValueError, match="requires a timezone"):
+        arr.append(datetime(2021, 3, 15, 10, 30))
+    with pytest.raises(ValueError, match="whole number of minutes"):
+        arr.append(datetime(2021, 3, 15, tzinfo=timezone(timedelta(seconds=30))))
+    assert len(arr) == 2
+
+
+def test_date_array() -> None:
+    """A FhirDateArray holds dates, keeping just the local date of a value with a time."""
+    arr = FhirDateArray.from_strings(["2021", "2021-03", b"2021-03-15"])
+    arr.extend([FhirDateTime(2021, 3, 15, 23, 30, tzinfo=UTC), date(1969, 12, 31)])
+    assert [v.isoformat() for v in arr] == ["2021", "2021-03", "2021-03-15", "2021-03-15", "1969-12-31"]
+    assert [type(v) for v in arr] == [FhirDate] * 5
+    assert list(arr.precisions) == [0, 1, 2, 2, 2]
+    with pytest.raises(ValueError, match="Unknown date format"):
+        FhirDateArray.from_strings(["2021-03-15T10:30:05Z"])
+
+
+def test_date_array_naive_datetime() -> None:
+    """A FhirDateArray takes the date of a naive datetime, which needs no offset as it keeps no time."""
+    arr = FhirDateArray([datetime(2021, 3, 15, 10, 30)])
+    arr.append(datetime(2021, 3, 16))
+    assert [v.isoformat() for v in arr] == ["2021-03-15", "2021-03-16"]
+    assert list(arr.precisions) == [2, 2]
+
+
+def test_abstract_base() -> None:
+    """A subclass missing an element conversion fails when created, not on first use."""
+
+    class Incomplete(_FhirArray[FhirDate]):
+        __slots__ = ()
+        _date_only = True
+
+    with pytest.raises(TypeError, match="abstract"):
+        Incomplete()  # ty: ignore[call-non-callable]
+
+
+def test_indexing() -> None:
+    """Negative indexes and slices work as on a list."""
+    arr = FhirDateTimeArray.from_strings(_STRINGS)
+    assert arr[-1] == FhirDateTime(_STRINGS[-1])
+    assert arr[1:3] == FhirDateTimeArray.from_strings(_STRINGS[1:3])
+    assert arr[::-1][0] == arr[-1]
+    with pytest.raises(IndexError):
+        arr[len(_STRINGS)]
+    assert arr != FhirDateArray.from_strings(_STRINGS[:3])
@@ -4,7 +4,7 @@ from datetime import UTC, date, datetime, timedelta, timezone
 
 import pytest
 
-from fhirdatetime import ComparableDateTimeTypes, FhirDateTime
+from fhirdatetime import ComparableDateTimeTypes, FhirDateTime, Relation
 
 
 def idfn(val: object) -> str:
@@ -99,6 +99,10 @@ eq = [
         FhirDateTime(2020, 2, 29, 19, 0, 2, tzinfo=ten_behind),
         FhirDateTime(2020, 3, 1, 5, 0, 2, tzinfo=utc),
     ),
+    (  # The last year's upper bound is past MAXYEAR
+        FhirDateTime(9999),
+        FhirDateTime(9999, 12, 31, 23, 59, 59, 999_999, tzinfo=utc),
+    ),
 ]
 
 eq_xf = [
@@ -136,6 +140,18 @@ gt = [
         FhirDateTime(2020, 2, 29, 19, 0, 3, tzinfo=ten_behind),
         FhirDateTime(2020, 3, 1, 5, 0, 2, tzinfo=utc),
     ),
+    (  # Later in UTC despite the earlier local time
+        FhirDateTime(2021, 4, 21, 3, 0, tzinfo=ten_behind),
+        FhirDateTime(2021, 4, 21, 12, 59, 59, 999_999, tzinfo=utc),
+    ),
+    (  # Bounds: the year ends exactly where the next month begins
+        FhirDateTime(2022, 1),
+        FhirDateTime(2021),
+    ),
+    (
+        FhirDateTime(2021, 3),
+        FhirDateTime(2021, 2, 28, 23, 59, 59, 999_999, tzinfo=utc),
+    ),
 ]
 
 lt = [(b, a) for a, b in gt]
@@ -217,3 +233,38 @@ def test_lt(obj_a: ComparableDateTimeTypes, obj_b: ComparableDateTimeTypes) -> N
 def test_lt_fail(obj_a: ComparableDateTimeTypes, obj_b: ComparableDateTimeTypes) -> None:
     """Tests for less than that should fail."""
     assert obj_a < obj_b
+
+
+@pytest.mark.parametrize(
+    ("obj_a", "obj_b", "expected"),
+    [
+        (FhirDateTime(2020), FhirDateTime(2021, 3), Relation.BEFORE),
+        (FhirDateTime(2021, 3), FhirDateTime(2020), Relation.AFTER),
+        (FhirDateTime(2021, 2), FhirDateTime(2021, 3, 1), Relation.BEFORE),
+        (FhirDateTime(2021), FhirDateTime(2021), Relation.EQUAL),
+        (FhirDateTime(2021, 3, 1), date(2021, 3, 1), Relation.EQUAL),
+        (FhirDateTime(2021), FhirDateTime(2021, 3), Relation.CONTAINS),
+        (FhirDateTime(2021, 3, 1, 0, 0, tzinfo=utc), FhirDateTime(2021, 3), Relation.WITHIN),
+        (FhirDateTime(2021, 3, 1), datetime(2021, 3, 1, 12, 0), Relation.CONTAINS),
+        (
+            FhirDateTime(2021, 3, 1, 12, 0, tzinfo=utc),
+            FhirDateTime(2021, 3, 1, 2, 0, tzinfo=ten_behind),
+            Relation.EQUAL,
+        ),
+        (
+            FhirDateTime(2021, 3, 1, 3, 0, tzinfo=ten_behind),
+            FhirDateTime(2021, 3, 1, 12, 0, tzinfo=utc),
+            Relation.AFTER,
+        ),
+    ],
+    ids=idfn,
+)
+def test_relation(obj_a: FhirDateTime, obj_b: ComparableDateTimeTypes, expected: Relation) -> None:
+    """relation() tells definite ordering apart from one interval containing the other."""
+    assert obj_a.relation(obj_b) is expected
+
+
+def test_relation_incompatible_type() -> None:
+    """relation() rejects non-date/datetime types like the ordering operators do."""
+    with pytest.raises(TypeError, match="Cannot compare FhirDateTime and str"):
+        FhirDateTime(2021).relation("2021")  # ty: ignore[invalid-argument-type]
@@ -0,0 +1,85 @@
+"""Tests for exact_key() and the containers hashing on it."""
+
+from __future__ import annotations
+
+from datetime import UTC, timedelta, timezone
+
+import pytest
+
+from fhirdatetime import FhirDate, FhirDateTime, FhirExactDict, FhirExactSet, Precision
+
+five_behind = timezone(timedelta(hours=-5))
+
+
+@pytest.mark.parametrize(
+    ("value", "precision"),
+    [
+        (FhirDate(2021), Precision.YEAR),
+        (FhirDateTime(2021, 3), Precision.MONTH),
+        (FhirDate(2021, 3, 15), Precision.DAY),
+        (FhirDateTime(2021, 3, 15, 10, 30, tzinfo=UTC), Precision.TIME),
+        (FhirDateTime.lazy("2021-03-15T10:30Z"), Precision.TIME),
+    ],
+)
+def test_precision(value: FhirDate, precision: Precision) -> None:
+    """precision reports how much of the value is populated."""
+    assert value.precision is precision
+
+
+def test_exact_key() -> None:
+    """exact_key() tells apart values that == conflates, but not the same instant at other offsets."""
+    keys = {
+        FhirDate(2021).exact_key(),
+        FhirDate(2021, 1).exact_key(),
+        FhirDate(2021, 1, 1).exact_key(),
+        FhirDateTime(2021, 1, 1, 0, 0, tzinfo=UTC).exact_key(),
+        FhirDateTime(2021, 1, 1, 0, 0, 0, 1, tzinfo=UTC).exact_key(),
+    }
+    assert len(keys) == 5
+    assert FhirDate(2021, 3).exact_key() == FhirDateTime("2021-03").exact_key()
+    assert (
+        FhirDateTime(2021, 1, 1, 0, 0, tzinfo=UTC).exact_key()
+        == FhirDateTime(2020, 12, 31, 19, 0, tzinfo=five_behind).exact_key()
+    )
+
+
+def test_exact_key_is_instant_sort_key() -> None:
+    """exact_key() is the instant sort key, and computing it caches nothing on the value."""
+    values = [FhirDateTime("2021-03-15T10:30:00-05:00"), FhirDateTime("2021-03"), FhirDateTime(2021)]
+    key = FhirDateTime.sort_key(by="instant")
+    assert [v.exact_key() for v in values] == [key(v) for v in values]
+    FhirExactSet(values)
+    assert all(v._bounds is None for v in values)
+
+
+def test_exact_set() -> None:
+    """FhirExactSet keeps one member per exact value, keeping the first added."""
+    first = FhirDateTime("2021-03-15T10:30:00Z")
+    values = FhirExactSet([first, FhirDate(2021), FhirDateTime(2021), FhirDateTime("2021-03-15T05:30:00-05:00")])
+    assert len(values) == 2
+    assert list(values) == [first, FhirDate(2021)]
+    assert next(iter(values)) is first
+    assert FhirDate(2021, 3) not in values
+    assert "2021" not in values
+    values.discard(FhirDate(2021))
+    assert len(values) == 1
+    assert values | FhirExactSet([FhirDate(2021, 3)]) == FhirExactSet([first, FhirDate(2021, 3)])
+
+
+def test_exact_dict() -> None:
+    """FhirExactDict keys on exact values, keeping the first key object like a dict does."""
+    d = FhirExactDict({FhirDate(2021): "year"})
+    d[FhirDate(2021, 3)] = "month"
+    d[FhirDateTime(2021)] = "year again"
+    assert d[FhirDate(2021)] == "year again"
+    assert type(next(iter(d))) is FhirDate
+    assert d == FhirExactDict([(FhirDate(2021), "year again"), (FhirDate(2021, 3), "month")])
+    assert (
+        repr(d) == "FhirExactDict({fhirdatetime.FhirDate(2021): 'year again', fhirdatetime.FhirDate(2021, 3): 'month'})"
+    )
+    del d[FhirDate(2021, 3)]
+    assert len(d) == 1
+    with pytest.raises(KeyError):
+        d[FhirDate(2021, 3)]
+    with pytest.raises(KeyError):
+        del d[2021]  # ty: ignore[invalid-argument-type]
@@ -0,0 +1,159 @@
+"""Tests for sorting NDJSON records with the external merge sort."""
+
+from __future__ import annotations
+
+import json
+import random
+from tempfile import TemporaryFile
+from typing import IO, TYPE_CHECKING
+
+import pytest
+
+from fhirdatetime import ExternalSorter, SortProgress, _external, sort_values
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from os import PathLike
+    from pathlib import Path
+
+
+def _records(n: int) -> list[bytes]:
+    rng = random.Random(1234)
+    records = []
+    for i in range(n):
+        start = rng.choice(
+            [
+                f"2021-{rng.randint(1, 12):02d}",
+                f"2021-04-{rng.randint(1, 28):02d}",
+                f"2021-04-12T{rng.randint(0, 23):02d}:00:00{rng.choice(['Z', '-05:00', '+01:00'])}",
+                None,
+            ]
+        )
+        period = {} if start is None else {"start": start}
+        records.append(json.dumps({"id": i, "period": period}).encode() + b"\n")
+    return records
+
+
+@pytest.mark.parametrize(("run_size", "fan_in"), [(1000, 64), (7, 64), (7, 2)])
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("by", ["fields", "instant"])
+def test_matches_sort_values(run_size: int, fan_in: int, reverse: bool, by: str, tmp_path: Path) -> None:
+    """The output is exactly sort_values()'s, whether sorted in memory, in one merge or in several."""
+    records = _records(200)
+    sorter = ExternalSorter(
+        "period.start",
+        run_size=run_size,
+        fan_in=fan_in,
+        missing="last",
+        by=by,  # ty: ignore[invalid-argument-type]
+        reverse=reverse,
+        tmp_dir=tmp_path,
+    )
+    expected = sort_values(
+        [json.loads(r) for r in records],
+        "period.start",
+        reverse,
+        missing="last",
+        by=by,  # ty: ignore[invalid-argument-type]
+    )
+    assert [json.loads(line) for line in sorter.sort(records)] == expected
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_progress(tmp_path: Path) -> None:
+    """The counters track records read, runs spilled and records written."""
+    records = _records(50)
+    sorter = ExternalSorter("period.start", run_size=10, tmp_dir=tmp_path)
+    lines = sorter.sort(records)
+    next(lines)
+    assert sorter.progress() == SortProgress(50, 5, sorter.bytes_spilled, 1)
+    assert sorter.bytes_spilled > sum(map(len, records))
+    assert len(list(lines)) == 49
+    assert sorter.records_written == 50
+
+    in_memory = ExternalSorter("period.start")
+    assert len(list(in_memory.sort(records))) == 50
+    assert in_memory.progress() == SortProgress(50, 0, 0, 50)
+
+
+def test_max_run_bytes(tmp_path: Path) -> None:
+    """A run is spilled once it holds max_run_bytes of input, however few records that is."""
+    records = _records(20)
+    sorter = ExternalSorter("period.start", max_run_bytes=1, tmp_dir=tmp_path)
+    list(sorter.sort(records))
+    assert sorter.runs_written == 20
+
+
+def test_lines() -> None:
+    """str lines are accepted, blank lines skipped, and every output line ends in a newline."""
+    sorter = ExternalSorter("date", run_size=1)
+    lines = ['{"date": "2021-04"}', "\n", '{"date": "2020"}\n', ""]
+    assert list(sorter.sort(lines)) == [b'{"date": "2020"}\n', b'{"date": "2021-04"}\n']
+
+
+def test_close_removes_runs(tmp_path: Path) -> None:
+    """Closing the generator early removes the spilled runs."""
+    sorter = ExternalSorter("period.start", run_size=5, tmp_dir=tmp_path)
+    lines = sorter.sort(_records(20))
+    next(lines)
+    lines.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.fixture
+def spilled(monkeypatch: pytest.MonkeyPatch) -> list[IO[bytes]]:
+    """Every temporary file the sorter opens, to check that they get closed."""
+    files: list[IO[bytes]] = []
+
+    def temporary_file(dir: str | PathLike[str] | None = None) -> IO[bytes]:  # noqa: A002 (as TemporaryFile's)
+        f = TemporaryFile(dir=dir)  # noqa: SIM115 (closed by the sorter, as tested)
+        files.append(f)
+        return f
+
+    monkeypatch.setattr(_external, "TemporaryFile", temporary_file)
+    return files
+
+
+def test_close_during_multi_pass_merge(spilled: list[IO[bytes]]) -> None:
+    """Closing the generator early closes every run, from every merge pass."""
+    sorter = ExternalSorter("period.start", run_size=1, fan_in=2)
+    lines = sorter.sort(_records(20))
+    next(lines)
+    assert sorter.runs_written > 20  # Merged over several passes
+    lines.close()
+    assert len(spilled) == sorter.runs_written
+    assert all(f.closed for f in spilled)
+
+
+def test_failed_merge_closes_runs(spilled: list[IO[bytes]]) -> None:
+    """A merge pass failing partway still closes the runs it already wrote."""
+
+    class FailingSorter(ExternalSorter):
+        def _spill(self, records: Iterable[tuple[int, bytes]]) -> IO[bytes]:
+            if self.runs_written == 25:
+                msg = "disk full"
+                raise OSError(msg)
+            return super()._spill(records)
+
+    sorter = FailingSorter("period.start", run_size=1, fan_in=2)
+    with pytest.raises(OSError, match="disk full"):
+        list(sorter.sort(_records(20)))
+    assert len(spilled) == 25
+    assert all(f.closed for f in spilled)
+
+
+def test_progress_reset_before_first_record() -> None:
+    """sort() resets the counters when called, not when its first record is read."""
+    sorter = ExternalSorter("period.start", run_size=10)
+    list(sorter.sort(_records(20)))
+    lines = sorter.sort(_records(5))
+    assert sorter.progress() == SortProgress(0, 0, 0, 0)
+    assert len(list(lines)) == 5
+    assert sorter.progress() == SortProgress(5, 0, 0, 5)
+
+
+@pytest.mark.parametrize("kwargs", [{"run_size": 0}, {"max_run_bytes": 0}, {"fan_in": 1}])
+def test_bad_arguments(kwargs: dict[str, int]) -> None:
+    """Run and merge sizes too small to make progress are rejected."""
+    with pytest.raises(ValueError, match="must be >="):
+        ExternalSorter("date", **kwargs)  # ty: ignore[invalid-argument-type]
@@ -2,16 +2,27 @@
 
 from __future__ import annotations
 
+import pickle
 import random
 import time as _time
-from datetime import UTC, date, datetime, time, timedelta, timezone
+from datetime import UTC, date, datetime, time, timedelta, timezone, tzinfo
 from pathlib import Path
 from types import SimpleNamespace
 from typing import TYPE_CHECKING
 
 import pytest
 
-from fhirdatetime import FhirDateTime, __version__
+from fhirdatetime import (
+    FhirDate,
+    FhirDateTime,
+    FhirDateTimeArray,
+    FhirExactSet,
+    ParseError,
+    SortedTimeline,
+    __version__,
+    argsort,
+    nsmallest,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -264,9 +275,7 @@ def test_other_methods() -> None:
     assert dt.isoformat(timespec="milliseconds") == "2020-05-04T13:42:54.295+03:00"
     with pytest.raises(ValueError, match="Unknown timespec value"):
         dt.isoformat(timespec="doesn't exist")
-    # No match=: the message comes from stdlib strptime's fallback path and its
-    # exact text is Python-version-dependent (see TODO.md's 3.14 strptime note).
-    with pytest.raises(ValueError):  # noqa: PT011
+    with pytest.raises(ValueError, match="Invalid isoformat string"):
         FhirDateTime.fromisoformat("2020*02*13")
 
     assert dt.weekday() == 0
@@ -330,9 +339,9 @@ def test_leap_second_normalized_to_59_on_parse() -> None:
     seconds"). Direct construction still rejects second=60 outright; only
     parsing normalizes it.
     """
-    # Numeric-offset path (vendored _DateTime.fromisoformat).
+    # Numeric offset.
     assert FhirDateTime.fromisoformat("2015-06-30T23:59:60+00:00") == FhirDateTime(2015, 6, 30, 23, 59, 59, tzinfo=UTC)
-    # Z-literal path (the strptime-based fallback).
+    # Z literal.
     assert FhirDateTime.fromisoformat("2015-06-30T23:59:60Z") == FhirDateTime(2015, 6, 30, 23, 59, 59, tzinfo=UTC)
     # Fractional seconds preserved through normalization.
     leap_with_fraction = FhirDateTime.fromisoformat("2015-06-30T23:59:60.5Z")
@@ -345,6 +354,251 @@ def test_leap_second_normalized_to_59_on_parse() -> None:
         FhirDateTime(2015, 6, 30, 23, 59, 60, tzinfo=UTC)
 
 
+@pytest.mark.parametrize(
+    ("string", "expected"),
+    [
+        ("2021-03-15T10:30Z", FhirDateTime(2021, 3, 15, 10, 30, tzinfo=UTC)),
+        ("2021-03-15 10:30:05Z", FhirDateTime(2021, 3, 15, 10, 30, 5, tzinfo=UTC)),
+        ("2021-03-15T10:30:05.1Z", FhirDateTime(2021, 3, 15, 10, 30, 5, 100_000, tzinfo=UTC)),
+        ("2021-03-15T10:30:05.123456789Z", FhirDateTime(2021, 3, 15, 10, 30, 5, 123_456, tzinfo=UTC)),
+        ("2021-03-15T10:30:05-00:00", FhirDateTime(2021, 3, 15, 10, 30, 5, tzinfo=UTC)),
+        (
+            "2021-03-15T10:30:05.25+05:30",
+            FhirDateTime(2021, 3, 15, 10, 30, 5, 250_000, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+        ),
+    ],
+)
+def test_fromisoformat_shapes(string: str, expected: FhirDateTime) -> None:
+    """fromisoformat() accepts every FHIR dateTime shape, including 1-9 fractional digits."""
+    parsed = FhirDateTime.fromisoformat(string)
+    assert parsed == expected
+    assert parsed.tzinfo == expected.tzinfo
+    assert parsed.microsecond == expected.microsecond
+
+
+@pytest.mark.parametrize(
+    ("string", "match"),
+    [
+        ("2021-03-15T10:30:05", "requires a timezone"),
+        ("2021-02-29", r"day must be in 1\.\.28"),
+        ("2021-03-15T24:00Z", r"hour must be in 0\.\.23"),
+        ("2021-03-15T10:61Z", r"minute must be in 0\.\.59"),
+        ("2021-03-15T10:30:61Z", r"second must be in 0\.\.59"),
+        ("2021-03-15T10:30:05.Z", "Invalid isoformat string"),
+        ("2021-03-15T10:30:05.1234567890Z", "Invalid isoformat string"),
+        ("2021-03-15T10:30:05+24:00", "Invalid isoformat string"),
+        ("2021-03-15T10:30:05+0530", "Invalid isoformat string"),
+        ("2021-03-15X10:30:05Z", "Invalid isoformat string"),
+        ("2021-+3-15T10:30:05Z", "Invalid isoformat string"),
+        ("\uff12\uff10\uff12\uff11", "Invalid isoformat string"),  # Full-width (non-ASCII) digits
+    ],
+)
+def test_fromisoformat_rejects(string: str, match: str) -> None:
+    """fromisoformat() rejects malformed and out-of-range values with a specific message."""
+    with pytest.raises(ValueError, match=match):
+        FhirDateTime.fromisoformat(string)
+
+
+@pytest.mark.parametrize(
+    ("string", "error"),
+    [
+        ("2021-03-15T10:30:05", ParseError.TZ_REQUIRED),
+        ("2021-02-29", ParseError.DAY_RANGE),
+        ("2021-03-15T24:00Z", ParseError.HOUR_RANGE),
+        ("2021-03-15X10:30:05Z", ParseError.MALFORMED),
+        ("", ParseError.MALFORMED),
+        (None, ParseError.MALFORMED),
+        (20210315, ParseError.MALFORMED),
+    ],
+)
+def test_try_parse_returns_error(string: str, error: ParseError) -> None:
+    """try_parse() returns a falsy ParseError instead of raising."""
+    assert FhirDateTime.try_parse(string) is error
+    assert not error
+
+
+def test_try_parse() -> None:
+    """try_parse() returns the same value as fromisoformat() for valid input."""
+    s = "2021-03-15T10:30:05.25+05:30"
+    parsed = FhirDateTime.try_parse(s)
+    assert type(parsed) is FhirDateTime
+    assert parsed == FhirDateTime.fromisoformat(s)
+    assert parsed.tzinfo == FhirDateTime.fromisoformat(s).tzinfo
+
+    assert FhirDate.try_parse("2021-03") == FhirDate(2021, 3)
+    assert FhirDate.try_parse("2021-03-15T10:30:05Z") is ParseError.MALFORMED
+
+
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+def test_parse_from_buffer(buffer_type: Callable[[bytes], bytes | bytearray | memoryview]) -> None:
+    """fromisoformat(), try_parse() and the constructors accept ASCII buffers."""
+    buf = buffer_type(b"id=1;2021-03-15T10:30:05-05:00;")
+    expected = FhirDateTime("2021-03-15T10:30:05-05:00")
+    assert FhirDateTime.fromisoformat(buf, 5, 30) == expected
+    assert FhirDateTime.try_parse(buf, 5, 30) == expected
+    assert FhirDateTime.try_parse(buf) is ParseError.MALFORMED
+    assert FhirDate.fromisoformat(buf, 5, 15) == FhirDate(2021, 3, 15)
+    assert FhirDateTime(buffer_type(b"2021-03")) == FhirDateTime(2021, 3)
+    assert FhirDate(buffer_type(b"2021-03-15T10:30:05Z")) == FhirDate(2021, 3, 15)
+
+
+@pytest.mark.parametrize(
+    ("string", "canonical"),
+    [
+        ("2021", True),
+        ("2021-03-15", True),
+        ("2021-03-15T10:30:05-05:00", True),
+        ("2021-03-15T10:30:05.123456+05:30", True),
+        ("2021-03-15T10:30:05Z", False),
+        ("2021-03-15T10:30:05.123-05:00", False),
+        ("2021-03-15T10:30:05.000000-05:00", False),
+        ("2021-03-15T10:30:60-05:00", False),
+        ("2021-03-15T10:30:05-00:00", False),
+        ("2021-03-15 10:30:05-05:00", False),
+    ],
+)
+def test_lazy_isoformat(string: str, canonical: bool) -> None:
+    """A lazy value answers isoformat() from its source only when that's already canonical."""
+    lazy = FhirDateTime.lazy(string)
+    assert lazy.isoformat() == FhirDateTime(string).isoformat()
+    assert lazy._lazy is canonical
+
+
+def test_lazy_parses_on_first_use() -> None:
+    """A lazy value parses once a field, comparison or hash needs it."""
+    s = "2021-03-15T10:30:05-05:00"
+    lazy = FhirDateTime.lazy(s)
+    assert lazy._lazy
+    assert str(lazy) == "2021-03-15 10:30:05-05:00"
+    assert lazy._lazy
+    assert lazy.minute == 30
+    assert not lazy._lazy
+    assert lazy.source == s
+
+    assert FhirDateTime.lazy(s) == FhirDateTime(s)
+    assert hash(FhirDateTime.lazy(s)) == hash(FhirDateTime(s))
+    assert FhirDateTime.lazy(s) < FhirDateTime.lazy("2021-03-15T10:30:06-05:00")
+    assert FhirDate.lazy(s.encode()) == FhirDate(2021, 3, 15)
+
+
+def test_lazy_rejects_on_first_use() -> None:
+    """A malformed lazy value raises the constructor's error when it's first parsed, every time."""
+    lazy = FhirDateTime.lazy("2021-03-15T10:30:05")
+    for _ in range(2):
+        with pytest.raises(ValueError, match="requires a timezone"):
+            _ = lazy.year
+    with pytest.raises(TypeError, match="must be str or ASCII bytes"):
+        FhirDateTime.lazy(2021)  # ty: ignore[invalid-argument-type]
+    with pytest.raises(AttributeError):
+        _ = FhirDate(2021).hour  # ty: ignore[unresolved-attribute]
+
+
+@pytest.mark.parametrize(
+    "string",
+    ["2021", "2021-03-15T10:30:05Z", "2021-03-15T10:30:05.123-05:00", "2021-03-15T10:30:60+05:30"],
+)
+def test_source_round_trip(string: str) -> None:
+    """Values parsed from a string keep it verbatim, and to_fhir()/pickling reproduce it."""
+    for dt in (
+        FhirDateTime(string),
+        FhirDateTime(string.encode()),
+        FhirDateTime.fromisoformat(string),
+        FhirDateTime.try_parse(string),
+        FhirDateTime.lazy(string),
+    ):
+        assert isinstance(dt, FhirDateTime)
+        assert dt.source == string
+        assert dt.to_fhir() == string
+        assert pickle.loads(pickle.dumps(dt)).source == string  # noqa: S301
+    assert FhirDateTime(string).isoformat() == FhirDateTime(string).replace().isoformat()
+
+
+def test_source_absent() -> None:
+    """Values not parsed from a string have no source, and to_fhir() falls back to isoformat()."""
+    dt = FhirDateTime(2021, 3, 15, 10, 30, tzinfo=UTC)
+    assert dt.source is None
+    assert dt.to_fhir() == "2021-03-15T10:30:00+00:00"
+    assert (dt + timedelta(days=1)).source is None
+    assert FhirDateTime("2021-03-15T10:30Z").replace(minute=31).source is None
+
+    d = FhirDate("2021-03-15T10:30:05Z")
+    assert d.source == "2021-03-15T10:30:05Z"
+    assert d.to_fhir() == "2021-03-15"
+    assert FhirDate.fromisoformat("2021-03").to_fhir() == "2021-03"
+
+
+def test_datetime_has_no_instance_dict() -> None:
+    """FhirDateTime keeps everything in slots, even once sort, hash and format caches are filled."""
+    dt = FhirDateTime("2021-03-15T10:30:05-05:00")
+    _ = dt < FhirDateTime(2021), hash(dt), dt.isoformat(), dt.utcoffset(), dt.to_fhir()
+    assert vars(dt) == {}
+    assert vars(dt + timedelta(days=1)) == {}
+    assert vars(FhirDateTime(2021, 3)) == {}
+
+
+def test_only_comparisons_cache_bounds() -> None:
+    """Keys and the helpers built on them leave a value's interval uncached; comparing caches it, sharing offsets."""
+    values = [FhirDateTime("2021-03-15T10:30:05-05:00"), FhirDateTime(2021, 3), FhirDateTime("2021-03-15T15:30:05Z")]
+    argsort(values, by="instant")
+    nsmallest(2, values, assume="latest")
+    SortedTimeline(values)
+    FhirExactSet(values)
+    FhirDateTimeArray(values)
+    assert all(v._bounds is None for v in values)
+
+    other = FhirDateTime("2022-01-01T00:00:00-05:00")
+    assert values[0] < other
+    assert values[0]._bounds is not None
+    assert values[0]._bounds[2] is other._bounds[2]
+
+
+_MANY = ["2021", "2021-03-15T10:30:05X", None, "2021-03-15T10:30:05Z", "2021-02-29"]
+
+
+def test_parse_many_skip() -> None:
+    """parse_many() drops bad values with errors="skip", as a list or a stream."""
+    expected = [FhirDateTime(2021), FhirDateTime("2021-03-15T10:30:05Z")]
+    assert FhirDateTime.parse_many(_MANY, errors="skip") == expected
+    stream = FhirDateTime.parse_many(iter(_MANY), errors="skip", stream=True)
+    assert not isinstance(stream, list)
+    assert list(stream) == expected
+
+
+def test_parse_many_collect() -> None:
+    """parse_many() reports (index, input, reason) for each bad value with errors="collect"."""
+    values, failures = FhirDate.parse_many(_MANY, errors="collect")
+    assert values == [FhirDate(2021)]
+    assert failures == [
+        (1, "2021-03-15T10:30:05X", ParseError.MALFORMED),
+        (2, None, ParseError.MALFORMED),
+        (3, "2021-03-15T10:30:05Z", ParseError.MALFORMED),
+        (4, "2021-02-29", ParseError.DAY_RANGE),
+    ]
+
+
+def test_parse_many_raise() -> None:
+    """parse_many() raises fromisoformat()'s exception, noting the index, by default."""
+    with pytest.raises(ValueError, match="Invalid isoformat string") as exc_info:
+        FhirDateTime.parse_many(_MANY)
+    assert exc_info.value.__notes__ == ["parse_many(): item 1 is '2021-03-15T10:30:05X'"]
+    with pytest.raises(TypeError):
+        FhirDateTime.parse_many(_MANY[2:3])
+    with pytest.raises(ValueError, match="errors must be one of"):
+        FhirDateTime.parse_many(_MANY, errors="ignore")  # ty: ignore[no-matching-overload]
+
+
+def test_parsed_offsets_are_interned() -> None:
+    """Values parsed with the same offset share one tzinfo object."""
+    a = FhirDateTime("2021-03-15T10:30:00-05:00")
+    b = FhirDateTime("1999-12-31T23:59:59.999-05:00")
+    assert a.tzinfo is b.tzinfo
+    assert a.tzinfo == timezone(timedelta(hours=-5))
+    assert FhirDateTime("2021-03-15T10:30:00-00:00").tzinfo is UTC
+    # Sub-minute offsets aren't interned, but still parse to the right value.
+    odd = FhirDateTime("2021-03-15T10:30:00+01:00:30")
+    assert odd.tzinfo == timezone(timedelta(hours=1, seconds=30))
+
+
 def test_offset_with_seconds_in_isoformat() -> None:
     """isoformat() renders a UTC offset with non-zero seconds/microseconds."""
     tz = timezone(timedelta(hours=-6, seconds=5))
@@ -356,6 +610,57 @@ def test_offset_with_seconds_in_isoformat() -> None:
     assert dt_us.isoformat() == "2011-09-12T12:14:31+01:00:00.250000"
 
 
+class _SummerTime(tzinfo):
+    """+01:00 from April through September, +00:00 otherwise."""
+
+    def utcoffset(self, dt: datetime | None) -> timedelta:
+        return timedelta(hours=1 if dt and 4 <= dt.month <= 9 else 0)
+
+    def dst(self, dt: datetime | None) -> timedelta:
+        return self.utcoffset(dt)
+
+    def tzname(self, dt: datetime | None) -> str:
+        return "BST" if self.utcoffset(dt) else "GMT"
+
+
+@pytest.mark.parametrize(
+    ("dt", "timespec", "expected"),
+    [
+        (FhirDateTime(2021), "auto", "2021"),
+        (FhirDateTime(2021, 3), "auto", "2021-03"),
+        (FhirDateTime(2021, 3, 5), "auto", "2021-03-05"),
+        (FhirDateTime(2021, 3, 5, 7, 8, tzinfo=UTC), "auto", "2021-03-05T07:08:00+00:00"),
+        (FhirDateTime(2021, 3, 5, 7, 8, 9, 10, tzinfo=UTC), "auto", "2021-03-05T07:08:09.000010+00:00"),
+        (FhirDateTime(2021, 3, 5, 7, 8, 9, 10, tzinfo=UTC), "minutes", "2021-03-05T07:08+00:00"),
+        (FhirDateTime(2021, 3, 5, 7, 8, 9, 12_345, tzinfo=UTC), "milliseconds", "2021-03-05T07:08:09.012+00:00"),
+        (FhirDateTime(2021, 1, 5, 7, 8, tzinfo=_SummerTime()), "auto", "2021-01-05T07:08:00+00:00"),
+        (FhirDateTime(2021, 7, 5, 7, 8, tzinfo=_SummerTime()), "auto", "2021-07-05T07:08:00+01:00"),
+    ],
+)
+def test_isoformat(dt: FhirDateTime, timespec: str, expected: str) -> None:
+    """isoformat() renders each precision, timespec, and per-value tzinfo offset."""
+    assert dt.isoformat(timespec=timespec) == expected
+    assert dt.isoformat(timespec=timespec) == expected  # Again, with the offset suffix cached
+
+
+def test_utcoffset_cached() -> None:
+    """utcoffset() asks the tzinfo once per instance, however it's then compared or formatted."""
+    calls = []
+
+    class CountingTz(_SummerTime):
+        def utcoffset(self, dt: datetime | None) -> timedelta:
+            calls.append(dt)
+            return super().utcoffset(dt)
+
+    dt = FhirDateTime(2021, 7, 5, 7, 8, tzinfo=CountingTz())
+    other = FhirDateTime(2021, 7, 5, 7, 8, tzinfo=UTC)
+    assert dt.utcoffset() == timedelta(hours=1)
+    assert dt < other
+    assert dt.isoformat() == "2021-07-05T07:08:00+01:00"
+    assert dt - other == timedelta(hours=-1)
+    assert len(calls) == 1
+
+
 def test_tzname() -> None:
     """tzname() reflects the tzinfo attached to the instance.
 
@@ -0,0 +1,137 @@
+"""Tests for interning values through the weak-value intern table."""
+
+from __future__ import annotations
+
+import gc
+from datetime import UTC, timedelta, timezone
+from typing import TYPE_CHECKING
+
+import pytest
+
+from fhirdatetime import FhirDate, FhirDateTime, InternTable, ParseError, intern_table, parse_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def interning() -> Iterator[InternTable]:
+    """Enable interning on parse for one test, then restore it to disabled."""
+    intern_table.clear()
+    intern_table.configure(enabled=True)
+    yield intern_table
+    intern_table.configure(enabled=False)
+    intern_table.clear()
+
+
+def test_intern_shares_equal_values() -> None:
+    """intern() returns the first instance of each exact value, whatever its type or fields."""
+    a = FhirDate(2021, 3, 15).intern()
+    assert FhirDate(2021, 3, 15).intern() is a
+    assert FhirDate.intern(FhirDate(2021, 3, 15)) is a
+    assert FhirDate(2021, 3).intern() is not a
+    assert FhirDateTime(2021, 3, 15).intern() is not a
+
+    dt = FhirDateTime(2021, 3, 15, 10, 30, tzinfo=UTC).intern()
+    assert FhirDateTime(2021, 3, 15, 10, 30, tzinfo=UTC).intern() is dt
+    assert FhirDateTime(2021, 3, 15, 10, 30, tzinfo=timezone(timedelta(hours=1))).intern() is not dt
+
+
+def test_intern_parsed_date_shares_constructed() -> None:
+    """A date has one spelling, so parsed and constructed dates intern to the same object."""
+    parsed = FhirDate.fromisoformat("2021-03-15").intern()
+    assert FhirDate(2021, 3, 15).intern() is parsed
+    assert FhirDate("2021-03-15T10:30:00Z").intern() is parsed
+    assert FhirDate(2021, 3).intern() is FhirDate.fromisoformat("2021-03").intern()
+
+
+@pytest.mark.usefixtures("interning")
+def test_parse_shares_constructed_date() -> None:
+    """Parsing a date returns the instance interned from constructing it, and vice versa."""
+    constructed = FhirDate(2021, 3, 15).intern()
+    assert FhirDate.fromisoformat("2021-03-15") is constructed
+    assert FhirDate.try_parse("2021-03-15") is constructed
+    parsed = FhirDate.fromisoformat("2022-01-01")
+    assert FhirDate(2022, 1, 1).intern() is parsed
+    assert FhirDate.fromisoformat("2022-01-01") is parsed
+
+
+@pytest.mark.usefixtures("interning")
+def test_parsed_date_may_lack_source() -> None:
+    """A parsed date shared with a constructed one has its source, None, but still round-trips."""
+    constructed = FhirDate(2021, 3, 15).intern()
+    parsed = FhirDate.fromisoformat("2021-03-15")
+    assert parsed is constructed
+    assert parsed.source is None
+    assert parsed.to_fhir() == "2021-03-15"
+
+
+@pytest.mark.usefixtures("interning")
+def test_parse_keeps_date_subclass() -> None:
+    """Parsing through a FhirDate subclass returns that subclass, interned apart from FhirDate."""
+
+    class BirthDate(FhirDate):
+        pass
+
+    plain = FhirDate.fromisoformat("2021-03-15")
+    birth = BirthDate.fromisoformat("2021-03-15")
+    assert type(birth) is BirthDate
+    assert birth is not plain
+    assert BirthDate.fromisoformat("2021-03-15") is birth
+    assert type(BirthDate.try_parse("2021-03-16")) is BirthDate
+
+
+def test_intern_keeps_source() -> None:
+    """Values parsed from different spellings stay distinct, so to_fhir() still round-trips."""
+    z = FhirDateTime("2021-03-15T10:30:00Z").intern()
+    assert FhirDateTime("2021-03-15T10:30:00Z").intern() is z
+    utc = FhirDateTime("2021-03-15T10:30:00+00:00").intern()
+    assert utc is not z
+    assert utc.to_fhir() == "2021-03-15T10:30:00+00:00"
+
+
+def test_intern_is_weak() -> None:
+    """The table drops a value once nothing else refers to it."""
+    intern_table.clear()
+    FhirDate(1999, 1, 2).intern()
+    gc.collect()
+    assert len(intern_table) == 0
+
+
+def test_parse_disabled_by_default() -> None:
+    """Parsing doesn't intern until the table is enabled."""
+    assert not intern_table.enabled
+    assert FhirDate.fromisoformat("2021-03-15") is not FhirDate.fromisoformat("2021-03-15")
+
+
+@pytest.mark.usefixtures("interning")
+@pytest.mark.parametrize("cls", [FhirDate, FhirDateTime])
+def test_parse_returns_shared_instance(cls: type[FhirDate]) -> None:
+    """Once enabled, every parsing entry point returns the interned instance."""
+    a = cls.fromisoformat("2021-03-15")
+    assert cls.fromisoformat(b"2021-03-15") is a
+    assert cls.try_parse("2021-03-15") is a
+    assert cls.parse_many(["2021-03-15", "2021-03-15"]) == [a, a]
+    assert all(v is a for v in cls.parse_many(["2021-03-15", "2021-03-15"]))
+    assert cls("2021-03-15").intern() is a
+    assert cls.try_parse("2021-02-30") is ParseError.DAY_RANGE
+
+
+@pytest.mark.usefixtures("interning")
+def test_parse_with_cache() -> None:
+    """Interning and the parse cache combine, still returning the interned instance."""
+    parse_cache.configure(1)
+    try:
+        a = FhirDateTime.fromisoformat("2021-03-15T10:30:00Z")
+        FhirDateTime.fromisoformat("2022-01-01")  # Evicts `a` from the cache
+        assert FhirDateTime.fromisoformat("2021-03-15T10:30:00Z") is a
+    finally:
+        parse_cache.configure(0)
+        parse_cache.clear()
+
+
+def test_identity_equality() -> None:
+    """A value is == itself without comparing fields, as happens often with interned values."""
+    d = FhirDate(2021, 3, 15)
+    assert d == d  # noqa: PLR0124
+    assert not d != d  # noqa: PLR0124, SIM202
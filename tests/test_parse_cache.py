@@ -0,0 +1,124 @@
+"""Tests for the opt-in LRU parse cache."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+
+from fhirdatetime import CacheInfo, FhirDate, FhirDateTime, ParseCache, ParseError, Relation, parse_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def enabled_cache() -> Iterator[ParseCache]:
+    """Enable the shared parse cache for one test, then restore it to disabled."""
+    parse_cache.clear()
+    parse_cache.configure(2)
+    yield parse_cache
+    parse_cache.configure(0)
+    parse_cache.clear()
+
+
+def test_disabled_by_default() -> None:
+    """Nothing is cached (or counted) until the cache is configured."""
+    assert parse_cache.maxsize == 0
+    a = FhirDateTime.fromisoformat("2021-03-15T10:30:00Z")
+    b = FhirDateTime.fromisoformat("2021-03-15T10:30:00Z")
+    assert a is not b
+    assert parse_cache.info().misses == 0
+    assert len(parse_cache) == 0
+
+
+def test_hits_return_shared_instance(enabled_cache: ParseCache) -> None:
+    """Repeated strings return the same, unchanged instance and count as hits."""
+    a = FhirDateTime.fromisoformat("2021-03-15T10:30:00Z")
+    b = FhirDateTime.fromisoformat("2021-03-15T10:30:00Z")
+    assert a is b
+    assert repr(b) == "fhirdatetime.FhirDateTime(2021, 3, 15, 10, 30, tzinfo=datetime.timezone.utc)"
+    assert enabled_cache.info() == (1, 1, 0, 2, 1)
+
+
+def test_memoised_state_keeps_value(enabled_cache: ParseCache) -> None:
+    """A shared instance compares, hashes and formats the same before and after its caches are filled."""
+    a = FhirDateTime.fromisoformat("2021-03-15T10:30:00-05:00")
+    formats = repr(a), a.isoformat(), a.to_fhir(), str(a)
+    assert a._bounds is None
+    assert a.relation(FhirDate(2021)) is Relation.WITHIN  # Fills `_bounds`
+    assert a.utcoffset() == timedelta(hours=-5)  # Fills `_utcoffset`
+    assert FhirDateTime.fromisoformat("2021-03-15T10:30:00-05:00") is a
+    assert a._bounds is not None
+    enabled_cache.configure(0)
+    fresh = FhirDateTime.fromisoformat("2021-03-15T10:30:00-05:00")
+    assert fresh is not a
+    assert (repr(a), a.isoformat(), a.to_fhir(), str(a)) == formats
+    assert a == fresh
+    assert hash(a) == hash(fresh)
+    assert a.exact_key() == fresh.exact_key()
+
+    lazy = FhirDateTime.lazy("2021-03-15T10:30:00-05:00")
+    before = lazy.isoformat(), lazy.to_fhir()
+    assert lazy == a  # Parses in place
+    assert (lazy.isoformat(), lazy.to_fhir()) == before
+    assert hash(lazy) == hash(a)
+
+
+def test_classes_cached_separately(enabled_cache: ParseCache) -> None:
+    """FhirDate and FhirDateTime parsing the same string never share an entry."""
+    d = FhirDate.fromisoformat("2021-03-15")
+    dt = FhirDateTime.fromisoformat("2021-03-15")
+    assert type(d) is FhirDate
+    assert type(dt) is FhirDateTime
+    assert enabled_cache.info().misses == 2
+
+
+def test_lru_eviction(enabled_cache: ParseCache) -> None:
+    """The least-recently-used entry is evicted once capacity is exceeded."""
+    first = FhirDateTime.fromisoformat("2021")
+    FhirDateTime.fromisoformat("2022")
+    assert FhirDateTime.fromisoformat("2021") is first  # Now most recently used
+    FhirDateTime.fromisoformat("2023")  # Evicts "2022"
+    assert FhirDateTime.fromisoformat("2021") is first
+    info = enabled_cache.info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+
+    enabled_cache.configure(1)
+    assert enabled_cache.info().evictions == 2
+    assert len(enabled_cache) == 1
+
+
+def test_constructor_uses_cache(enabled_cache: ParseCache) -> None:
+    """String construction goes through the cache but still builds a new instance."""
+    a = FhirDateTime("2021-03-15T10:30:00-05:00")
+    b = FhirDateTime("2021-03-15T10:30:00-05:00")
+    assert a is not b
+    assert a == b
+    assert enabled_cache.info().hits == 1
+    assert FhirDate("2021-03-15T10:30:00-05:00") == FhirDate(2021, 3, 15)
+
+
+def test_errors_not_cached(enabled_cache: ParseCache) -> None:
+    """Malformed input raises every time and never occupies a slot."""
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Invalid isoformat string"):
+            FhirDateTime.fromisoformat("not a date")
+    assert len(enabled_cache) == 0
+
+
+def test_try_parse_shares_cache(enabled_cache: ParseCache) -> None:
+    """try_parse() hits the same entries as fromisoformat() and never caches errors."""
+    a = FhirDateTime.fromisoformat("2021-03-15T10:30:00Z")
+    assert FhirDateTime.try_parse("2021-03-15T10:30:00Z") is a
+    assert FhirDateTime.try_parse("not a date") is ParseError.MALFORMED
+    assert FhirDateTime.try_parse(None) is ParseError.MALFORMED
+    assert enabled_cache.info() == CacheInfo(hits=1, misses=2, evictions=0, maxsize=2, currsize=1)
+
+
+def test_negative_maxsize_rejected() -> None:
+    """configure() rejects a negative capacity."""
+    with pytest.raises(ValueError, match="maxsize must be >= 0"):
+        ParseCache(-1)
@@ -0,0 +1,82 @@
+"""Tests for parse_fields(), the allocation-light parsing API."""
+
+from __future__ import annotations
+
+import pytest
+
+from fhirdatetime import FhirDateTime, Precision, parse_fields
+
+
+@pytest.mark.parametrize(
+    ("string", "expected"),
+    [
+        ("2021", (2021, None, None, None, None, 0, 0, None, Precision.YEAR)),
+        ("2021-03", (2021, 3, None, None, None, 0, 0, None, Precision.MONTH)),
+        ("2021-03-15", (2021, 3, 15, None, None, 0, 0, None, Precision.DAY)),
+        ("2021-03-15T20:54Z", (2021, 3, 15, 20, 54, 0, 0, 0, Precision.TIME)),
+        ("2021-03-15T20:54:07.25-05:00", (2021, 3, 15, 20, 54, 7, 250_000, -18_000, Precision.TIME)),
+        ("2021-03-15T20:54:60+05:30", (2021, 3, 15, 20, 54, 59, 0, 19_800, Precision.TIME)),
+        ("2021-03-15T20:54:00-06:00:05", (2021, 3, 15, 20, 54, 0, 0, -21_605, Precision.TIME)),
+    ],
+)
+def test_parse_fields(string: str, expected: tuple) -> None:
+    """parse_fields() returns plain numbers in constructor field order."""
+    fields = parse_fields(string)
+    assert fields == expected
+    assert type(fields) is tuple
+
+
+@pytest.mark.parametrize(
+    "string",
+    ["2021", "2021-03", "2021-03-15", "2021-03-15T20:54:07.25-05:00", "2021-03-15T20:54:07Z"],
+)
+def test_parse_fields_agrees_with_constructor(string: str) -> None:
+    """The constructor builds on parse_fields(), so their fields agree exactly."""
+    year, month, day, hour, minute, second, microsecond, offset, _ = parse_fields(string)
+    dt = FhirDateTime(string)
+    assert (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond) == (
+        year,
+        month,
+        day,
+        hour,
+        minute,
+        second,
+        microsecond,
+    )
+    utcoffset = dt.utcoffset()
+    assert (None if utcoffset is None else utcoffset.total_seconds()) == offset
+
+
+@pytest.mark.parametrize(
+    ("string", "match"),
+    [
+        ("2021-13", r"month must be in 1\.\.12"),
+        ("2021-03-15T20:54:07", "requires a timezone"),
+        ("20210315", "Invalid isoformat string"),
+    ],
+)
+def test_parse_fields_validates(string: str, match: str) -> None:
+    """parse_fields() rejects what the constructors reject, with the same messages."""
+    with pytest.raises(ValueError, match=match):
+        parse_fields(string)
+    with pytest.raises(ValueError, match=match):
+        FhirDateTime(string)
+
+
+def test_parse_fields_from_buffer() -> None:
+    """parse_fields() accepts ASCII bytes-likes and a start/end window into them."""
+    line = b'{"effectiveDateTime":"2021-03-15T20:54:07Z","status":"final"}'
+    expected = (2021, 3, 15, 20, 54, 7, 0, 0, Precision.TIME)
+    assert parse_fields(line[22:42]) == expected
+    assert parse_fields(bytearray(line), 22, 42) == expected
+    assert parse_fields(memoryview(line), 22, 42) == expected
+    assert parse_fields(line.decode(), 22, 42) == expected
+    with pytest.raises(ValueError, match="Invalid isoformat string"):
+        parse_fields("2021-03-15".encode("utf-16"))
+    with pytest.raises(ValueError, match="Invalid isoformat string"):
+        parse_fields("２０２１".encode())  # noqa: RUF001
+
+
+def test_precision_ordering() -> None:
+    """Precision values order from least to most precise."""
+    assert Precision.YEAR < Precision.MONTH < Precision.DAY < Precision.TIME
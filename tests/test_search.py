@@ -0,0 +1,94 @@
+"""Tests for implied interval bounds and FHIR date search prefixes."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta, timezone
+
+import pytest
+
+from fhirdatetime import FhirDate, FhirDateTime, matches
+
+_EST = timezone(timedelta(hours=-5))
+
+
+@pytest.mark.parametrize(
+    ("value", "lower", "upper"),
+    [
+        (FhirDate(2021), datetime(2021, 1, 1), datetime(2021, 12, 31, 23, 59, 59, 999999)),
+        (FhirDate(2020, 2), datetime(2020, 2, 1), datetime(2020, 2, 29, 23, 59, 59, 999999)),
+        (FhirDateTime(2021, 3, 15), datetime(2021, 3, 15), datetime(2021, 3, 15, 23, 59, 59, 999999)),
+        (FhirDate(9999), datetime(9999, 1, 1), datetime.max),
+        (
+            FhirDateTime("2021-03-15T10:30:00-05:00"),
+            datetime(2021, 3, 15, 10, 30, tzinfo=_EST),
+            datetime(2021, 3, 15, 10, 30, tzinfo=_EST),
+        ),
+    ],
+)
+def test_bounds(value: FhirDate, lower: datetime, upper: datetime) -> None:
+    """The bounds are the first and last instants of the implied interval, with the value's tzinfo."""
+    assert value.lower_bound() == lower
+    assert value.upper_bound() == upper
+    assert value.lower_bound().tzinfo == lower.tzinfo
+    assert value.upper_bound().tzinfo == upper.tzinfo
+
+
+_TARGETS = [
+    FhirDate(2021),
+    FhirDate(2021, 2),
+    FhirDate(2021, 3),
+    FhirDate(2021, 3, 15),
+    FhirDate(2021, 4),
+    FhirDateTime(2021, 3, 31, 23, 59, 59, 999999, tzinfo=UTC),
+    FhirDateTime(2021, 4, 1, 0, 0, tzinfo=UTC),
+    date(2021, 3, 1),
+    datetime(2021, 2, 28, 23, 59),
+    None,
+]
+
+
+@pytest.mark.parametrize(
+    ("prefix", "expected"),
+    [
+        ("eq", [False, False, True, True, False, True, False, True, False, False]),
+        ("ne", [True, True, False, False, True, False, True, False, True, False]),
+        ("gt", [True, False, False, False, True, False, True, False, False, False]),
+        ("lt", [True, True, False, False, False, False, False, False, True, False]),
+        ("ge", [True, False, True, True, True, True, True, True, False, False]),
+        ("le", [True, True, True, True, False, True, False, True, True, False]),
+        ("sa", [False, False, False, False, True, False, True, False, False, False]),
+        ("eb", [False, True, False, False, False, False, False, False, True, False]),
+    ],
+)
+def test_prefixes(prefix: str, expected: list[bool]) -> None:
+    """Each prefix compares the target's implied interval with March 2021's."""
+    match = matches(prefix, "2021-03")  # ty: ignore[invalid-argument-type]
+    assert [match(t) for t in _TARGETS] == expected
+
+
+def test_offsets() -> None:
+    """Values with offsets compare in UTC, as the comparison operators do."""
+    match = matches("eq", FhirDateTime("2021-03-15T10:30:00-05:00"))
+    assert match(FhirDateTime("2021-03-15T15:30:00Z"))
+    assert match(datetime(2021, 3, 15, 15, 30, tzinfo=UTC))
+    assert not match(FhirDateTime("2021-03-15T10:30:00Z"))
+    assert matches("sa", "2021-03-15T15:30:00Z")(FhirDateTime("2021-03-15T10:30:00.000001-05:00"))
+
+
+def test_approximately() -> None:
+    """ap widens the value's interval by 10% of its distance from now."""
+    now = datetime(2021, 1, 11, tzinfo=UTC)
+    match = matches("ap", "2021-01-01", now=now)  # A day either side
+    assert match(FhirDate(2020, 12, 31))
+    assert match(FhirDateTime("2021-01-02T23:59:59Z"))
+    assert not match(FhirDate(2020, 12, 30))
+    assert not match(FhirDate(2021, 1, 3))
+    assert match(FhirDate(2020))  # Any overlap
+    assert matches("ap", "2021-01-10", now=now)(FhirDate(2021, 1, 11))  # 2.4 hours either side
+    assert not matches("ap", "2021-01-10", now=now)(FhirDateTime("2021-01-11T03:00:00Z"))
+
+
+def test_bad_prefix() -> None:
+    """Anything but a FHIR date search prefix is rejected."""
+    with pytest.raises(ValueError, match="prefix must be one of eq, ne, gt, lt, ge, le, sa, eb, ap, not 'sw'"):
+        matches("sw", "2021")  # ty: ignore[invalid-argument-type]
@@ -2,11 +2,32 @@
 
 from __future__ import annotations
 
-from typing import NamedTuple
+import random
+from datetime import UTC, timedelta, timezone
+from itertools import permutations
+from typing import TYPE_CHECKING, NamedTuple
+from zoneinfo import ZoneInfo
 
 import pytest
 
-from fhirdatetime import FhirDateTime
+from fhirdatetime import (
+    FhirDate,
+    FhirDateArray,
+    FhirDateTime,
+    FhirDateTimeArray,
+    SortedTimeline,
+    argsort,
+    earliest,
+    latest,
+    nlargest,
+    nsmallest,
+    sort_values,
+)
+from fhirdatetime._path import _compile_path
+from fhirdatetime._sort import _array_keys
+
+if TYPE_CHECKING:
+    from fhirdatetime import SortBy
 
 
 class Period(NamedTuple):
@@ -57,3 +78,288 @@ def test_sorting_top_level(pre_sort: list[FhirDateTime], post_sort: list[FhirDat
 def test_sorting_embedded(pre_sort: list[CarePlan], post_sort: list[CarePlan], obj_path: str) -> None:
     """Test sorting of a list of objects that contain FhirDateTime objects."""
     assert sorted(pre_sort, key=FhirDateTime.sort_key(obj_path)) == post_sort
+
+
+def test_sort_key_is_int() -> None:
+    """sort_key() produces one int per value, ordering fields left to right with missing ones first."""
+    tz = timezone(timedelta(hours=-5))
+    values = [
+        FhirDateTime(2021, 4, 12, 0, 0, tzinfo=UTC),
+        FhirDateTime(2021, 12, 31, 23, 59, 59, 999_999, tzinfo=UTC),
+        FhirDateTime(2022),
+        FhirDateTime(2021, 4, 12, 0, 0, 0, 1, tzinfo=tz),
+        FhirDateTime(2021, 4),
+        FhirDateTime(2021, 4, 12),
+        FhirDateTime(2021),
+        FhirDateTime(2021, 4, 11, 23, 59, tzinfo=UTC),
+    ]
+    key = FhirDateTime.sort_key()
+    assert all(type(key(v)) is int for v in values)
+    assert [v.isoformat() for v in sorted(values, key=key)] == [
+        "2021",
+        "2021-04",
+        "2021-04-11T23:59:00+00:00",
+        "2021-04-12",
+        "2021-04-12T00:00:00+00:00",
+        "2021-04-12T00:00:00.000001-05:00",
+        "2021-12-31T23:59:59.999999+00:00",
+        "2022",
+    ]
+
+
+def test_sort_key_caches_nothing() -> None:
+    """Building sort keys leaves the values' cached interval unset, so a sort retains no memory."""
+    values = [FhirDateTime("2021-04-12T10:00:00-05:00"), FhirDateTime(2021, 4)]
+    dates = [FhirDate(2021, 4, 12), FhirDate(2021)]
+    values.sort(key=FhirDateTime.sort_key())
+    values.sort(key=FhirDateTime.sort_key(by="instant"))
+    dates.sort(key=FhirDate.sort_key())
+    assert all(v._bounds is None for v in [*values, *dates])
+
+
+def test_date_sort_key_ignores_time() -> None:
+    """FhirDate.sort_key() orders FhirDateTime values by date alone, keeping ties stable."""
+    key = FhirDate.sort_key()
+    values = [
+        FhirDateTime(2021, 4, 12, 10, 0, tzinfo=UTC),
+        FhirDate(2021, 4),
+        FhirDateTime(2021, 4, 12, 9, 0, tzinfo=UTC),
+    ]
+    assert sorted(range(3), key=lambda i: key(values[i])) == [1, 0, 2]
+    assert key(values[0]) == key(FhirDate(2021, 4, 12))
+
+
+def test_sort_key_json_path() -> None:
+    """A path follows mapping keys and list indexes, parsing the string it leads to."""
+    resources = [
+        {"identifier": [{"period": {"end": "2021-04-12T10:00:00Z"}}]},
+        {"identifier": [{"period": {"end": "2021"}}]},
+        {"identifier": [{"period": {"end": "2021-04"}}, {"period": {"end": "1999"}}]},
+    ]
+    key = FhirDateTime.sort_key("identifier[0].period.end")
+    assert sorted(range(3), key=lambda i: key(resources[i])) == [1, 2, 0]
+    assert key(resources[1]) == FhirDateTime.sort_key()(FhirDateTime(2021))
+    assert FhirDate.sort_key("identifier[-1].period.end")(resources[2]) == FhirDate.sort_key()(FhirDate(1999))
+
+
+@pytest.mark.parametrize("path", ["period[0].start", "period.start[0]", "identifier.period.start"])
+def test_sort_key_path_shape_mismatch(path: str) -> None:
+    """A step that doesn't fit the data, such as an index into a mapping, leads nowhere."""
+    item = {"identifier": [{"period": {"start": "2021"}}], "period": {"start": 2021}}
+    assert _compile_path(path)(item) is None
+    assert FhirDateTime.sort_key(path)(item) == -1
+    with pytest.raises(TypeError, match="not NoneType"):
+        FhirDateTime.sort_key(path, missing="raise")(item)
+
+
+@pytest.mark.parametrize(("missing", "expected"), [("first", [1, 2, 3, 0]), ("last", [0, 1, 2, 3])])
+def test_sort_key_missing(missing: str, expected: list[int]) -> None:
+    """Items whose path leads nowhere sort first or last, keeping their order."""
+    items = [
+        CarePlan(Period(start=FhirDateTime(2021), end=None)),
+        CarePlan(Period(start=None, end=None)),
+        {"period": {}},
+        {"period": None},
+    ]
+    key = FhirDateTime.sort_key("period.start", missing=missing)  # ty: ignore[no-matching-overload]
+    assert sorted(range(4), key=lambda i: key(items[i])) == expected
+
+
+def test_sort_key_missing_raise() -> None:
+    """missing="raise" rejects a path leading nowhere, as any path leading to a non-FHIR value is."""
+    key = FhirDate.sort_key("identifier[1].start", missing="raise")
+    with pytest.raises(TypeError, match="must lead to an instance of FhirDate, not NoneType"):
+        key({"identifier": [{"start": "2021"}]})
+    with pytest.raises(TypeError, match="not int"):
+        FhirDate.sort_key("start")({"start": 2021})
+    with pytest.raises(AttributeError):
+        FhirDate.sort_key("strat")(Period(start=None, end=None))
+
+
+@pytest.mark.parametrize("path", ["", "a..b", "a.", "a[0", "a[x]", "a]"])
+def test_sort_key_bad_path(path: str) -> None:
+    """A malformed path is rejected up front, as is an unknown missing position."""
+    with pytest.raises(ValueError, match="invalid attribute path"):
+        FhirDateTime.sort_key(path)
+    with pytest.raises(ValueError, match="missing must be one of first, last, raise"):
+        FhirDateTime.sort_key("a", missing="middle")  # ty: ignore[no-matching-overload]
+
+
+def test_sort_key_path_compiled_once() -> None:
+    """Compiled paths are cached by path string."""
+    assert _compile_path("identifier[0].period.end") is _compile_path("identifier[0].period.end")
+
+
+def test_sort_key_instant() -> None:
+    """sort_key(by="instant") orders values by UTC instant, then coarsest precision first."""
+    values = [
+        FhirDateTime("2021-04-12T10:00:00-05:00"),
+        FhirDateTime("2021-04-12T12:00:00Z"),
+        FhirDateTime("2021-04-12"),
+        FhirDateTime("2021-04-12T00:00:00Z"),
+        FhirDateTime("2021-04-12T01:00:00+01:00"),
+        FhirDateTime("2021-04"),
+        FhirDateTime("0001-01-01T00:00:00+14:00"),
+        FhirDateTime(2021, 4, 12, 8, 30, tzinfo=ZoneInfo("America/New_York")),
+    ]
+    key = FhirDateTime.sort_key(by="instant")
+    assert all(type(key(v)) is int and key(v) >= 0 for v in values)
+    assert [v.isoformat() for v in sorted(values, key=key)] == [
+        "0001-01-01T00:00:00+14:00",
+        "2021-04",
+        "2021-04-12",
+        "2021-04-12T00:00:00+00:00",
+        "2021-04-12T01:00:00+01:00",  # The same instant, so stable
+        "2021-04-12T12:00:00+00:00",
+        "2021-04-12T08:30:00-04:00",
+        "2021-04-12T10:00:00-05:00",
+    ]
+
+
+def test_sort_key_instant_path() -> None:
+    """by="instant" combines with attribute paths and missing values."""
+    items = [{"start": "2021-04-12T10:00:00-05:00"}, {}, {"start": "2021-04-12T12:00:00Z"}]
+    key = FhirDateTime.sort_key("start", missing="last", by="instant")
+    assert sorted(range(3), key=lambda i: key(items[i])) == [2, 0, 1]
+    with pytest.raises(ValueError, match="by must be 'fields' or 'instant', not 'utc'"):
+        FhirDateTime.sort_key(by="utc")  # ty: ignore[invalid-argument-type]
+
+
+_MIXED = [
+    "2021-04-12T10:00:00-05:00",
+    "2021-04-12T12:00:00Z",
+    "2021-04",
+    "2021-04-12T10:00:00+01:00",
+    "2021-04-12",
+    "2021",
+    "2021-04-12T15:00:00Z",
+    "2021-04-12T10:00:00-05:00",
+]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("by", ["fields", "instant"])
+def test_sort_values(by: SortBy, reverse: bool) -> None:
+    """sort_values()/argsort() sort exactly as sorted() with sort_key(), stably, for lists and arrays alike."""
+    values = [FhirDateTime(s) for s in _MIXED]
+    key = FhirDateTime.sort_key(by=by)
+    expected = sorted(range(len(values)), key=lambda i: key(values[i]), reverse=reverse)
+    assert argsort(values, by=by, reverse=reverse) == expected
+    assert [v.source for v in sort_values(values, by=by, reverse=reverse)] == [_MIXED[i] for i in expected]
+
+    arr = FhirDateTimeArray.from_strings(_MIXED)
+    assert argsort(arr, by=by, reverse=reverse) == expected
+    sorted_arr = sort_values(arr, by=by, reverse=reverse)
+    assert type(sorted_arr) is FhirDateTimeArray
+    assert sorted_arr == FhirDateTimeArray.from_strings([_MIXED[i] for i in expected])
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("by", ["fields", "instant"])
+def test_sort_values_array_random(by: SortBy, reverse: bool) -> None:
+    """Arrays rebuilt from their sorted keys match sorting their elements, offsets and all."""
+    rng = random.Random(21)
+    strings = [
+        rng.choice(
+            [
+                f"{rng.choice([1, 1969, 2021, 9999]):04d}",
+                f"{rng.choice([1, 2021]):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                f"{rng.choice([1, 2021]):04d}-04-12T{rng.randint(10, 12)}:00:00{rng.choice(['Z', '-01:00', '+01:00'])}",
+            ]
+        )
+        for _ in range(500)
+    ]
+    arr = FhirDateTimeArray.from_strings(strings)
+    expected = FhirDateTimeArray(sort_values(list(arr), by=by, reverse=reverse))
+    assert sort_values(arr, by=by, reverse=reverse) == expected
+    dates = FhirDateArray(arr)
+    assert sort_values(dates, by=by, reverse=reverse) == FhirDateArray(sort_values(list(dates), reverse=reverse))
+
+
+@pytest.mark.parametrize("by", ["fields", "instant"])
+def test_array_keys_are_sort_keys(by: SortBy) -> None:
+    """An array's keys are exactly its elements' sort_key(), so the two can be merged or compared."""
+    arr = FhirDateTimeArray.from_strings([*_MIXED, "0001-01-01T00:00:00+14:00", "9999-12-31T23:59:59-12:00", "1969"])
+    key = FhirDateTime.sort_key(by=by)
+    assert _array_keys(arr, by) == [key(v) for v in arr]
+    dates = FhirDateArray(arr)
+    assert _array_keys(dates, by) == list(map(FhirDate.sort_key(), dates))
+
+
+def test_sort_values_date_array() -> None:
+    """A FhirDateArray sorts by date, coarsest first."""
+    arr = FhirDateArray.from_strings(["2021-04-12", "2021", "1999-12-31", "2021-04"])
+    assert argsort(arr) == [2, 1, 3, 0]
+    assert [v.isoformat() for v in sort_values(arr, reverse=True)] == ["2021-04-12", "2021-04", "2021", "1999-12-31"]
+
+
+def test_sort_values_key_path() -> None:
+    """A key_path works as it does for sort_key(), but not on an array."""
+    items = [{"start": "2021-04"}, {}, {"start": "2020"}]
+    assert argsort(items, "start") == [1, 2, 0]
+    assert sort_values(items, "start", missing="last") == [{"start": "2020"}, {"start": "2021-04"}, {}]
+    arr = FhirDateTimeArray.from_strings(["2021"])
+    with pytest.raises(TypeError, match="key_path can't be used with an array"):
+        argsort(arr, "start")
+    with pytest.raises(ValueError, match="by must be 'fields' or 'instant'"):
+        sort_values(arr, by="utc")  # ty: ignore[no-matching-overload]
+
+
+def test_key_path_to_fhir_date() -> None:
+    """A key_path may lead to a plain FhirDate, placed at the start of its date."""
+    items = [{"d": FhirDateTime("2021-04-12T10:00:00Z")}, {"d": FhirDate(2021, 4, 12)}, {"d": FhirDate(2021)}]
+    assert argsort(items, "d") == [2, 1, 0]
+    assert argsort(items, "d", by="instant") == [2, 1, 0]
+    assert list(map(id, sort_values(items, "d", reverse=True))) == list(map(id, items))
+    assert nsmallest(1, items, "d", assume="latest")[0] is items[0]
+    assert list(map(id, SortedTimeline(items, "d"))) == list(map(id, reversed(items)))
+    assert FhirDateTime.sort_key("d")(items[1]) == FhirDateTime.sort_key("d")({"d": FhirDateTime(2021, 4, 12)})
+
+
+@pytest.mark.parametrize("n", [0, 1, 3, len(_MIXED), len(_MIXED) + 1])
+@pytest.mark.parametrize("by", ["fields", "instant"])
+def test_top_k_matches_sort_values(n: int, by: SortBy) -> None:
+    """By default, the top-k helpers pick exactly sort_values()'s first or last n items."""
+    values = [FhirDateTime(s) for s in _MIXED]
+    ascending = sort_values(values, by=by)
+    descending = sort_values(values, reverse=True, by=by)
+    assert [id(v) for v in nsmallest(n, values, by=by)] == [id(v) for v in ascending[:n]]
+    assert [id(v) for v in nlargest(n, values, by=by)] == [id(v) for v in descending[:n]]
+    assert earliest(values, by=by) is ascending[0]
+    assert latest(values, by=by) is descending[0]
+
+
+@pytest.mark.parametrize("values", list(permutations([FhirDateTime(2021, 6), FhirDateTime(2021), FhirDate(2021, 12)])))
+def test_top_k_assume(values: tuple[FhirDate, ...]) -> None:
+    """assume picks the end of a partial value's interval to rank by, whatever the order of the input."""
+    first, last = earliest(values), latest(values)
+    assert first is not None
+    assert last is not None
+    assert (first.isoformat(), last.isoformat()) == ("2021", "2021-12")
+    last = latest(values, assume="latest")
+    assert last is not None
+    assert last.isoformat() == "2021"
+    assert [v.isoformat() for v in nsmallest(3, values, assume="latest")] == ["2021-06", "2021-12", "2021"]
+    assert [v.isoformat() for v in nlargest(2, values, assume="latest")] == ["2021", "2021-12"]
+
+
+def test_top_k_skips_missing() -> None:
+    """The top-k helpers match sort_values() once items without a value are left out."""
+    items = [{"start": "2021-04"}, {}, {"start": "2020"}, {"start": None}, {"start": "2021"}]
+    present = [item for item in items if item.get("start") is not None]
+    for n in range(len(items) + 1):
+        assert list(map(id, nsmallest(n, items, "start"))) == list(map(id, sort_values(present, "start")[:n]))
+        assert list(map(id, nlargest(n, items, "start"))) == list(
+            map(id, sort_values(present, "start", reverse=True)[:n])
+        )
+    assert sort_values(items, "start")[:2] == [{}, {"start": None}]
+
+
+def test_top_k_key_path() -> None:
+    """Items whose key_path leads to no value are skipped."""
+    items = [{"start": "2021-04"}, {}, {"start": "2021-04-12T10:00:00-05:00"}, {"start": None}]
+    assert nlargest(5, items, "start", assume="latest", by="instant") == [items[0], items[2]]
+    assert earliest(items[1:2], "start") is None
+    assert latest(items[1:2], "start", default=items[1]) is items[1]
+    with pytest.raises(ValueError, match="assume must be 'earliest' or 'latest', not 'middle'"):
+        nsmallest(1, items, "start", assume="middle")  # ty: ignore[invalid-argument-type]
@@ -0,0 +1,109 @@
+"""Tests for the SortedTimeline container and its range queries."""
+
+from __future__ import annotations
+
+import random
+from datetime import UTC, date, datetime, timedelta, timezone
+
+import pytest
+
+from fhirdatetime import FhirDate, FhirDateTime, SortedTimeline, sort_values
+
+_STRINGS = [
+    "2021-03-15T10:30:00-05:00",  # 15:30Z
+    "2021-03",
+    "2021-03-15",
+    "2021-03-15T15:30:00Z",
+    "2021",
+    "2021-03-15T12:00:00+01:00",  # 11:00Z
+    "2021-04-01T00:00:00Z",
+    "2021-02-28T23:59:59.999999Z",
+]
+
+
+@pytest.fixture
+def timeline() -> SortedTimeline[FhirDateTime]:
+    """A timeline of _STRINGS' values, added in a shuffled order."""
+    values = [FhirDateTime(s) for s in _STRINGS]
+    random.Random(3).shuffle(values)
+    tl = SortedTimeline(values[:4])
+    for value in values[4:]:
+        tl.add(value)
+    return tl
+
+
+def _sources(items: list[FhirDateTime]) -> list[str | None]:
+    return [v.source for v in items]
+
+
+def _source(item: FhirDateTime | None) -> str | None:
+    return None if item is None else item.source
+
+
+def test_order(timeline: SortedTimeline[FhirDateTime]) -> None:
+    """Items are kept in sort_values(by="instant") order, whether added in bulk or one by one."""
+    assert len(timeline) == len(_STRINGS)
+    expected = _sources(sort_values([FhirDateTime(s) for s in _STRINGS], by="instant"))
+    assert _sources(list(timeline)) == expected
+    assert _sources(timeline[2:4]) == expected[2:4]
+    assert timeline[-1].source == "2021-04-01T00:00:00Z"
+
+
+def test_between(timeline: SortedTimeline[FhirDateTime]) -> None:
+    """between() takes a start bound at its first instant and an end bound at its last."""
+    assert _sources(timeline.between(FhirDate(2021, 3), FhirDate(2021, 3))) == [
+        "2021-03",
+        "2021-03-15",
+        "2021-03-15T12:00:00+01:00",
+        "2021-03-15T10:30:00-05:00",
+        "2021-03-15T15:30:00Z",
+    ]
+    assert _sources(timeline.between(FhirDateTime("2021-03-15T11:00:00Z"), date(2021, 3, 31))) == [
+        "2021-03-15T12:00:00+01:00",
+        "2021-03-15T10:30:00-05:00",
+        "2021-03-15T15:30:00Z",
+    ]
+    assert _sources(timeline.between(end=datetime(2021, 2, 28, tzinfo=UTC))) == ["2021"]
+    # An instant's last instant is itself, so an item starting at an end given as an instant is included.
+    assert _sources(timeline.between(end=datetime(2021, 3, 1, tzinfo=UTC))) == [
+        "2021",
+        "2021-02-28T23:59:59.999999Z",
+        "2021-03",
+    ]
+    assert _sources(timeline.between(FhirDate(2021, 4))) == ["2021-04-01T00:00:00Z"]
+    assert timeline.between(FhirDate(2022)) == []
+
+
+def test_first_after_last_before(timeline: SortedTimeline[FhirDateTime]) -> None:
+    """first_after() looks past all of its bound, and last_before() before any of it."""
+    assert _source(timeline.first_after(FhirDate(2021, 3))) == "2021-04-01T00:00:00Z"
+    noon = FhirDateTime("2021-03-15T12:00:00Z")
+    assert _source(timeline.first_after(noon)) == "2021-03-15T10:30:00-05:00"
+    assert _source(timeline.last_before(noon)) == "2021-03-15T12:00:00+01:00"
+    naive = datetime(2021, 3, 15, 11)  # A local time, like a value without an offset
+    assert _source(timeline.last_before(naive)) == "2021-03-15"
+    assert timeline.last_before(FhirDate(2021)) is None
+    assert timeline.first_after(FhirDate(2021, 4, 1)) is None
+
+
+def test_key_path() -> None:
+    """Items are keyed by the value at key_path, which they must have."""
+    tl = SortedTimeline([{"start": "2021-03-15"}, {"start": "2021-01"}], "start")
+    tl.update([{"start": "2021-02-01T00:00:00+01:00"}])
+    assert [item["start"] for item in tl] == ["2021-01", "2021-02-01T00:00:00+01:00", "2021-03-15"]
+    assert tl.last_before(FhirDate(2021, 2)) == {"start": "2021-02-01T00:00:00+01:00"}  # 2021-01-31T23:00Z
+    with pytest.raises(TypeError, match="must lead to an instance of FhirDateTime or FhirDate, not NoneType"):
+        tl.add({})
+    assert len(tl) == 3
+
+
+def test_remove() -> None:
+    """remove() takes out the first equal item among those with the same key."""
+    tz = timezone(timedelta(hours=1))
+    a, b = FhirDateTime(2021, 3, 15, 12, 0, tzinfo=tz), FhirDateTime(2021, 3, 15, 11, 0, tzinfo=UTC)
+    tl = SortedTimeline([a, FhirDate(2021, 3), b])
+    tl.remove(b)
+    assert list(tl) == [FhirDate(2021, 3), b]
+    assert tl[1] is b
+    with pytest.raises(ValueError, match="not in timeline"):
+        tl.remove(FhirDateTime(2021, 3, 15, 11, 1, tzinfo=UTC))